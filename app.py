@@ -1,146 +1,290 @@
 """
-Streamlit application that focuses solely on JSON output.
-This version is stripped down to the essentials to ensure reliable JSON output.
+Streamlit application for extracting structured module/submodule information from documentation websites.
+`streamlit run app.py` shows the JSON output only; app_simple.py renders the full view with
+statistics, a module browser and the custom output format.
 """
-import streamlit as st
-import json
 import time
-from urllib.parse import urlparse
-from modules.crawler import Crawler
+import streamlit as st
+from modules.crawler import Crawler, CrawlError
+from modules.executors import get_pool
+from modules.formatter import Formatter
 from modules.parser import Parser
-from modules.utils import is_valid_url, normalize_url
-
-# Set page configuration
-st.set_page_config(
-    page_title="Documentation Structure Extractor",
-    page_icon="📚",
-    layout="wide"
-)
-
-# Simple header
-st.markdown("## Documentation Structure Extractor")
-
-# URL input
-url = st.text_input("Enter a documentation website URL:", "")
-
-# Sidebar options
-st.sidebar.title("Options")
-max_pages = st.sidebar.slider("Maximum pages to crawl:", 5, 100, 20)
-timeout = st.sidebar.slider("Request timeout (seconds):", 1, 10, 3)
-
-# Process button
-if st.button("Extract Structure"):
-    if not url:
-        st.error("Please enter a URL.")
+from modules.pipeline import run_pipeline
+from modules.utils import is_valid_url, normalize_url, cached_urlparse
+
+# Outputs larger than this are previewed, not highlighted in full; the download has everything
+CODE_PREVIEW_THRESHOLD = 100_000
+CODE_PREVIEW_CHARS = 50_000
+
+
+# Keep crawler and parser instances (and the crawler's connection pool) alive across reruns
+@st.cache_resource
+def get_crawler(timeout, max_pages):
+    """
+    Get a shared crawler for the given options.
+
+    Args:
+        timeout (int): Timeout for HTTP requests in seconds
+        max_pages (int): Maximum number of pages to crawl
+
+    Returns:
+        Crawler: Crawler instance shared between reruns and sessions
+    """
+    return Crawler(
+        max_depth=1,
+        timeout=timeout,
+        max_pages=max_pages,
+        max_workers=10,
+        executor=get_pool(10)
+    )
+
+
+@st.cache_resource
+def get_parser(aggressive=True):
+    """
+    Get a shared parser.
+
+    Args:
+        aggressive (bool): Whether to use aggressive submodule detection
+
+    Returns:
+        Parser: Parser instance shared between reruns and sessions
+    """
+    # Parses in worker processes, one per spare core; the pool starts on the first large batch
+    # and lives as long as this cached instance
+    return Parser(
+        quick_mode=False,
+        aggressive_submodule_detection=aggressive
+    )
+
+
+# Cache results for an hour so reruns with the same inputs skip the crawl
+@st.cache_data(ttl=3600, show_spinner=False)
+def run_extraction(url, max_pages, timeout):
+    """
+    Run the extraction pipeline for a documentation website.
+
+    Args:
+        url (str): Normalized URL of the documentation website
+        max_pages (int): Maximum number of pages to crawl
+        timeout (int): Timeout for HTTP requests in seconds
+
+    Returns:
+        dict: Pipeline result, see modules.pipeline.run_pipeline
+
+    Raises:
+        CrawlError: If no pages could be crawled, so failures are not cached
+    """
+    return run_pipeline(
+        url,
+        max_pages=max_pages,
+        timeout=timeout,
+        crawler=get_crawler(timeout, max_pages),
+        parser=get_parser()
+    )
+
+
+def show_code(data):
+    """
+    Show text as highlighted JSON, truncating large outputs to a preview.
+
+    Args:
+        data (str or bytes): Text, or UTF-8 encoded text, to display
+    """
+    if len(data) > CODE_PREVIEW_THRESHOLD:
+        # Only the preview slice is decoded; a multi-byte character cut at the end is dropped
+        preview = data[:CODE_PREVIEW_CHARS]
+        if isinstance(preview, bytes):
+            preview = preview.decode("utf-8", errors="ignore")
+        st.code(preview + "\n... (truncated, download full file)", language="json")
+    else:
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        st.code(data, language="json")
+
+
+def show_full_results(domain, result, total_time):
+    """
+    Render statistics, a module browser, the JSON output and the custom format.
+
+    Args:
+        domain (str): Domain of the crawled website
+        result (dict): Pipeline result
+        total_time (float): Total processing time in seconds
+    """
+    formatted_modules = result["formatted_modules"]
+
+    # Display results
+    st.subheader(f"Results for {domain}")
+
+    # Display statistics
+    st.markdown(f"""
+    **Statistics:**
+    - Pages crawled: {result["pages_count"]}
+    - Modules found: {len(formatted_modules)}
+    - Submodules found: {result["total_submodules"]}
+    - Total time: {total_time:.2f} seconds
+    """)
+
+    if not formatted_modules:
+        st.warning("No modules found. Try a different URL.")
+        return
+
+    # Create tabs for different views
+    tab1, tab2, tab3 = st.tabs(["Modules & Submodules", "JSON Output", "Custom Format"])
+
+    with tab1:
+        for module in formatted_modules:
+            with st.expander(f"{module.module}"):
+                st.markdown(f"**Description:** {module.description}")
+
+                if module.submodules:
+                    st.markdown("**Submodules:**")
+
+                    # Create a simple table for submodules
+                    for submodule_name, submodule_desc in module.submodules:
+                        st.markdown(f"- **{submodule_name}**: {submodule_desc}")
+                else:
+                    st.markdown("*No submodules found*")
+
+    with tab2:
+        # Download button for standard JSON, in the Formatter's format like the custom format below
+        st.download_button(
+            label="Download JSON",
+            data=Formatter().to_json(result["modules"]).encode("utf-8"),
+            file_name=f"{domain}_modules.json",
+            mime="application/json"
+        )
+
+        # Display the JSON using st.write instead of st.json
+        st.write("### JSON Output")
+        for i, module in enumerate(formatted_modules):
+            st.write(f"**Module {i+1}:** {module.module}")
+            st.write(f"**Description:** {module.description}")
+
+            if module.submodules:
+                st.write("**Submodules:**")
+                for submodule_name, submodule_desc in module.submodules:
+                    st.write(f"- **{submodule_name}:** {submodule_desc}")
+
+            st.write("---")
+
+    with tab3:
+        # Generate custom format
+        custom_format = Formatter().to_custom_format(result["modules"])
+
+        # Download button for custom format
+        st.download_button(
+            label="Download Custom Format",
+            data=custom_format,
+            file_name=f"{domain}_modules_custom.json",
+            mime="text/plain"
+        )
+
+        # Display the custom format
+        show_code(custom_format)
+
+
+def show_json_results(domain, result):
+    """
+    Render the JSON output with a download button.
+
+    Args:
+        domain (str): Domain of the crawled website
+        result (dict): Pipeline result
+    """
+    json_bytes = result["json_bytes"]
+
+    # Display the JSON output
+    st.markdown(f"### JSON Output")
+
+    # Download button for JSON
+    st.download_button(
+        label="Download JSON",
+        data=json_bytes,
+        file_name=f"{domain}_modules.json",
+        mime="application/json"
+    )
+
+    # Display the JSON
+    show_code(json_bytes)
+
+
+def main(variant="json"):
+    """
+    Render the Streamlit app.
+
+    Args:
+        variant (str): "json" to show only the JSON output, "full" for the full results view
+    """
+    # Set page configuration
+    st.set_page_config(
+        page_title="Documentation Structure Extractor",
+        page_icon="📚",
+        layout="wide"
+    )
+
+    if variant == "full":
+        # App title and description
+        st.title("Documentation Structure Extractor")
+        st.markdown("""
+        This application extracts structured module/submodule information from documentation websites.
+        Enter a URL below to get started.
+        """)
     else:
+        # Simple header
+        st.markdown("## Documentation Structure Extractor")
+
+    # URL input
+    url = st.text_input("Enter a documentation website URL:", "")
+
+    # Sidebar options
+    st.sidebar.title("Options")
+    max_pages = st.sidebar.slider("Maximum pages to crawl:", 5, 100, 20)
+    timeout = st.sidebar.slider("Request timeout (seconds):", 1, 10, 3)
+
+    # Process button
+    if st.button("Extract Structure"):
+        if not url:
+            st.error("Please enter a URL.")
+            return
+
         # Normalize and validate URL
         url = normalize_url(url)
         if not is_valid_url(url):
             st.error("Please enter a valid URL.")
+            return
+
+        # Extract domain for display
+        domain = cached_urlparse(url).netloc
+
+        # Main progress bar
+        progress_bar = st.progress(0)
+        status = st.empty()
+
+        # Crawl, parse and format the website (cached per url, max_pages and timeout)
+        status.text(f"Crawling and parsing {domain}...")
+        progress_bar.progress(10)
+
+        start_time = time.time()
+        try:
+            result = run_extraction(url, max_pages, timeout)
+        except CrawlError:
+            st.error(f"Failed to crawl {domain}. Please check the URL and try again.")
+            return
+
+        # Calculate total time
+        total_time = time.time() - start_time
+
+        # Complete progress
+        progress_bar.progress(100)
+        status.text("Done!")
+
+        if variant == "full":
+            show_full_results(domain, result, total_time)
         else:
-            # Extract domain for display
-            domain = urlparse(url).netloc
-
-            # Main progress bar
-            progress_bar = st.progress(0)
-            status = st.empty()
-
-            # Step 1: Crawl the website
-            status.text(f"Crawling {domain}...")
-            progress_bar.progress(10)
-
-            # Initialize crawler
-            crawler = Crawler(
-                max_depth=1,
-                timeout=timeout,
-                max_pages=max_pages,
-                max_workers=10
-            )
-
-            # Start crawling
-            start_time = time.time()
-            pages = crawler.crawl(url)
-            crawl_time = time.time() - start_time
-
-            if not pages:
-                st.error(f"Failed to crawl {domain}. Please check the URL and try again.")
-            else:
-                # Update progress
-                progress_bar.progress(40)
-                status.text(f"Parsing content from {len(pages)} pages...")
-
-                # Step 2: Parse the HTML content
-                parse_start_time = time.time()
-                parser = Parser(
-                    max_workers=5,
-                    quick_mode=False,
-                    aggressive_submodule_detection=True
-                )
-
-                # Parse the content
-                all_modules = parser.parse_html_batch(pages)
-                parse_time = time.time() - parse_start_time
-
-                # Update progress
-                progress_bar.progress(70)
-                status.text("Formatting results...")
-
-                # Step 3: Format the results directly to JSON
-                formatted_modules = []
-                for module in all_modules:
-                    if not module.get("module"):
-                        continue
-
-                    # Get description from either field name
-                    description = module.get("Description", "")
-                    if not description:
-                        description = module.get("description", "")
-                    if not description:
-                        description = "No description available"
-
-                    # Get submodules from either field name
-                    submodules = module.get("Submodules", {})
-                    if not submodules:
-                        submodules = module.get("submodules", {})
-                    if not isinstance(submodules, dict):
-                        submodules = {}
-
-                    # Clean submodules
-                    cleaned_submodules = {}
-                    for name, desc in submodules.items():
-                        if not name:
-                            continue
-                        cleaned_submodules[str(name)] = str(desc) if desc else "No description available"
-
-                    # Create formatted module
-                    formatted_module = {
-                        "module": str(module.get("module", "")),
-                        "Description": str(description),
-                        "Submodules": cleaned_submodules
-                    }
-
-                    formatted_modules.append(formatted_module)
-
-                # Create JSON directly
-                json_output = json.dumps(formatted_modules, indent=2)
-
-                # Calculate total time
-                total_time = time.time() - start_time
-
-                # Complete progress
-                progress_bar.progress(100)
-                status.text("Done!")
-
-                # Display the JSON output
-                st.markdown(f"### JSON Output")
-
-                # Download button for JSON
-                st.download_button(
-                    label="Download JSON",
-                    data=json_output,
-                    file_name=f"{domain}_modules.json",
-                    mime="application/json"
-                )
-
-                # Display the JSON
-                st.code(json_output, language="json")
+            show_json_results(domain, result)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,16 +4,37 @@ Module Extractor - Command line tool to extract structured module/submodule info
 """
 import argparse
 import json
+import os
 import sys
 import time
-from urllib.parse import urlparse
-from modules.crawler import Crawler
-from modules.parser import Parser
+from joblib import Memory
+from joblib.memory import expires_after
 from modules.formatter import Formatter
-from modules.utils import is_valid_url, normalize_url
+from modules.pipeline import crawl_and_parse
+from modules.utils import is_valid_url, normalize_url, cached_urlparse
 
+# Persist crawl results across runs, keyed on the normalized URL and options
+memory = Memory(os.path.expanduser("~/.cache/module_extractor"), verbose=0)
 
-def extract_modules(url, max_pages=20, timeout=5, aggressive=True):
+
+def print_progress(percent, message):
+    """
+    Print the pipeline's progress messages.
+
+    Args:
+        percent (int): Progress percentage, unused on the command line
+        message (str): Progress message
+    """
+    print(message)
+
+
+# Expire cached results after an hour, matching the app's cache TTL; the progress callback
+# and the optional crawler and parser are not part of the cache key
+cached_crawl_and_parse = memory.cache(crawl_and_parse, ignore=['progress', 'crawler', 'parser'],
+                                      cache_validation_callback=expires_after(hours=1))
+
+
+def extract_modules(url, max_pages=20, timeout=5, aggressive=True, use_cache=True):
     """
     Extract modules and submodules from a documentation website.
 
@@ -22,6 +43,7 @@ def extract_modules(url, max_pages=20, timeout=5, aggressive=True):
         max_pages (int): Maximum number of pages to crawl
         timeout (int): Timeout for HTTP requests in seconds
         aggressive (bool): Whether to use aggressive submodule detection
+        use_cache (bool): Whether to reuse crawl results cached on disk by earlier runs
 
     Returns:
         str: JSON string with extracted modules and submodules
@@ -33,47 +55,21 @@ def extract_modules(url, max_pages=20, timeout=5, aggressive=True):
         return "{}"
 
     # Extract domain for display
-    domain = urlparse(url).netloc
+    domain = cached_urlparse(url).netloc
 
     print(f"Extracting modules from {domain}...")
 
     try:
-        # Step 1: Crawl the website
-        print(f"Crawling {domain}...")
-        crawler = Crawler(
-            max_depth=1,  # Only crawl the main page and direct links
-            timeout=timeout,
-            max_pages=max_pages,
-            max_workers=10
-        )
-
-        # Start crawling
         start_time = time.time()
-        pages = crawler.crawl(url)
-        crawl_time = time.time() - start_time
-
-        if not pages:
-            print(f"Error: Failed to crawl {domain}")
-            return "{}"
-
-        print(f"Crawled {len(pages)} pages in {crawl_time:.2f} seconds")
-
-        # Step 2: Parse the HTML content
-        print(f"Parsing content...")
-        parse_start_time = time.time()
-
-        # Initialize parser with aggressive settings for better submodule detection
-        parser = Parser(
-            max_workers=5,
-            quick_mode=False,
-            aggressive_submodule_detection=aggressive
-        )
-
-        # Parse the content
-        all_modules = parser.parse_html_batch(pages)
-        parse_time = time.time() - parse_start_time
 
-        print(f"Parsed {parser.pages_processed} pages in {parse_time:.2f} seconds")
+        # Steps 1 and 2: Crawl and parse, reusing cached results when available
+        if use_cache:
+            if cached_crawl_and_parse.check_call_in_cache(url, max_pages, timeout, aggressive):
+                print(f"Using cached results for {domain}")
+            pages_count, all_modules = cached_crawl_and_parse(url, max_pages, timeout, aggressive,
+                                                              progress=print_progress)
+        else:
+            pages_count, all_modules = crawl_and_parse(url, max_pages, timeout, aggressive, progress=print_progress)
 
         # Step 3: Format the results
         formatter = Formatter()
@@ -105,6 +101,7 @@ def main():
     parser.add_argument('--timeout', type=int, default=5, help='Timeout for HTTP requests in seconds')
     parser.add_argument('--output', type=str, help='Output file path (default: stdout)')
     parser.add_argument('--no-aggressive', action='store_true', help='Disable aggressive submodule detection')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore crawl results cached by earlier runs')
 
     args = parser.parse_args()
 
@@ -113,12 +110,13 @@ def main():
         args.urls,
         max_pages=args.max_pages,
         timeout=args.timeout,
-        aggressive=not args.no_aggressive
+        aggressive=not args.no_aggressive,
+        use_cache=not args.no_cache
     )
 
     # Output the result
     if args.output:
-        with open(args.output, 'w') as f:
+        with open(args.output, 'w', encoding='utf-8') as f:
             f.write(json_output)
         print(f"Output written to {args.output}")
     else:
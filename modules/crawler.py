@@ -1,23 +1,147 @@
 """
 Web crawler functionality for the documentation structure extractor.
 """
+import asyncio
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 import concurrent.futures
+import hashlib
+import re
+import threading
+from collections import OrderedDict, deque
+from contextlib import nullcontext
+from itertools import islice
 import time
-from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
-from .utils import is_valid_url, normalize_url, is_same_domain
+from email.utils import parsedate_to_datetime
+from urllib.parse import urljoin
+import lxml.html
+from .utils import is_valid_url, normalize_url, cached_urlparse, make_same_domain_checker, BloomFilter
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is optional, crawl_async falls back to threads
+    aiohttp = None
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Responses that are not HTML, or declare a larger body than this, are dropped before reading
+HTML_CONTENT_TYPES = {'text/html', 'application/xhtml+xml'}
+MAX_CONTENT_LENGTH = 5_000_000
+
+# Markup that differs between copies of the same page (inline scripts and styles, digits in
+# timestamps or build ids), ignored when comparing page contents
+_DUPLICATE_NOISE_RE = re.compile(rb'<script\b.*?</script>|<style\b.*?</style>|\d', re.IGNORECASE | re.DOTALL)
+
+# Concurrent requests allowed per host, and the longest Retry-After pause honoured (seconds)
+MAX_REQUESTS_PER_HOST = 4
+MAX_RETRY_AFTER = 10
+
+# Links followed from each page, which also bounds the number of URLs a crawl can see
+MAX_LINKS_PER_PAGE = 50
+
+# Pages remembered with their ETag/Last-Modified validators, so re-crawls can send conditional requests
+VALIDATOR_CACHE_SIZE = 256
+
+# Links whose URL or anchor text mention one of these are crawled first
+_DOC_KW_RE = re.compile(r'doc|api|reference|guide|manual|tutorial|module|class|function', re.IGNORECASE)
+
+# Default headers that work for most sites, set once on each session.
+# Accept-Encoding lists the codecs urllib3 can decode here: brotli and zstd when installed, gzip and deflate always
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Cache-Control': 'max-age=0'
+}
+
+# Byte range of a page the crawler reads (300KB); servers that honour it stop sending there
+_RANGE_HEADERS = {'Range': 'bytes=0-307199'}
+
+# aiohttp advertises the codecs it can decode itself, which may differ from urllib3's
+_ASYNC_HEADERS = {name: value for name, value in DEFAULT_HEADERS.items() if name != 'Accept-Encoding'}
+
+# First main content container in document order, like the CSS selector list
+# 'main, #main, .main, #content, .content, article, .article, .documentation, #documentation'
+def _class_token(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+_MAIN_CONTENT_XPATH = (
+    "(//main | //*[@id='main'] | //*[" + _class_token('main') + "]"
+    " | //*[@id='content'] | //*[" + _class_token('content') + "] | //article"
+    " | //*[" + _class_token('article') + "] | //*[" + _class_token('documentation') + "]"
+    " | //*[@id='documentation'])[1]"
+)
+
+# lxml parsers must not be shared between threads, so each thread gets its own
+_thread_local = threading.local()
+
+def _parse_retry_after(value):
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value (str): Delay in seconds or an HTTP date
+
+    Returns:
+        float or None: Delay in seconds, or None if missing or malformed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+def _html_parser():
+    """
+    Get this thread's lxml HTML parser.
+
+    Returns:
+        lxml.html.HTMLParser: Parser reused for every page parsed on this thread
+    """
+    parser = getattr(_thread_local, 'html_parser', None)
+    if parser is None:
+        parser = _thread_local.html_parser = lxml.html.HTMLParser()
+    return parser
+
+class CrawlError(Exception):
+    """
+    Raised when a crawl does not return any pages.
+    """
+
+
 class Crawler:
     """
     Web crawler for documentation websites.
     """
 
-    def __init__(self, max_depth=3, timeout=10, max_pages=100, max_workers=10):
+    # Per-site header overrides, built once; the defaults live on the session
+    _NO_HEADERS = {}
+    _FB_DOMAINS = ('facebook.com', 'meta.com')
+    # Additional headers that might help with access to Facebook sites
+    _FB_HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.127 Safari/537.36',
+        'sec-ch-ua': '" Not A;Brand";v="99", "Chromium";v="100", "Google Chrome";v="100"',
+        'sec-ch-ua-mobile': '?0',
+        'sec-ch-ua-platform': '"Windows"',
+        'Sec-Fetch-Dest': 'document',
+        'Sec-Fetch-Mode': 'navigate',
+        'Sec-Fetch-Site': 'none',
+        'Sec-Fetch-User': '?1',
+        'Referer': 'https://www.google.com/'
+    }
+
+    def __init__(self, max_depth=3, timeout=10, max_pages=100, max_workers=10, executor=None):
         """
         Initialize the crawler.
 
@@ -26,81 +150,316 @@ class Crawler:
             timeout (int): Timeout for HTTP requests in seconds
             max_pages (int): Maximum number of pages to crawl
             max_workers (int): Maximum number of worker threads for parallel crawling
+            executor (concurrent.futures.ThreadPoolExecutor): Optional shared pool to crawl on
+                instead of starting a new pool for every crawl; it is not shut down by the crawler
         """
         self.max_depth = max_depth
         self.timeout = timeout
         self.max_pages = max_pages
         self.max_workers = max_workers
-        self.visited_urls = set()
-        self.pages = {}  # Dictionary to store page content: {url: html_content}
-        self.links_to_crawl = []  # Queue of links to crawl
+        self.executor = executor
+        self.reset()
+
+        # One crawl at a time, so a cached instance can be shared between app sessions
+        self._crawl_lock = threading.Lock()
+
+        # Per-host request limits, and when each rate limited host may be contacted again
+        self.max_per_host = min(MAX_REQUESTS_PER_HOST, max_workers)
+        self._host_semaphores = {}
+        self._next_ok_at = {}
+
+        # Guards the visited set and filter and the counters, which process_url updates from worker threads.
+        # Fetching and link extraction run outside it.
+        self._state_lock = threading.Lock()
+
+        # {url: (etag, last_modified, html_bytes)} of recently fetched pages, kept across crawls
+        # so unchanged pages come back as bodiless 304 responses; least recently used first
+        self.url_meta = OrderedDict()
+
+        # Share one session so keep-alive connections are pooled across fetches,
+        # retrying transient gateway errors with a short backoff. A 503's Retry-After is not
+        # honoured there, since urllib3 would sleep for as long as the server asks, past MAX_RETRY_AFTER
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(
+            pool_connections=max_workers,
+            pool_maxsize=max_workers * 2,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504],
+                              respect_retry_after_header=False)
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def close(self):
+        """
+        Close the pooled HTTP session.
+        """
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def reset(self):
+        """
+        Clear the state of a previous crawl so the instance can be reused.
+        """
+        # The only record of URLs seen, sized for every link a crawl can queue (the start URL and up to
+        # MAX_LINKS_PER_PAGE links per page); a rare false positive only skips a URL
+        self.visited_bloom = BloomFilter(capacity=self.max_pages * MAX_LINKS_PER_PAGE + 1)
+        self.content_digests = set()  # Digests of stored pages, to skip duplicate contents
+        self._in_flight = 0  # Pages being fetched by crawl_async
+        self.pages = {}  # Dictionary to store page content: {url: html_bytes}
+        self.page_encodings = {}  # Charsets stated by Content-Type headers: {url: charset}
+        self.links_to_crawl = deque()  # Queue of (url, depth) links to crawl
         self.pages_crawled = 0  # Counter for pages crawled
         self.successful_pages = 0  # Counter for successfully crawled pages
 
-    def fetch_url(self, url):
+    def _host_semaphore(self, host):
+        """
+        Get the semaphore limiting concurrent threaded requests to a host.
+
+        Args:
+            host (str): Host name, with port if any
+
+        Returns:
+            threading.Semaphore: Semaphore allowing max_per_host concurrent requests
+        """
+        with self._state_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = self._host_semaphores[host] = threading.Semaphore(self.max_per_host)
+            return semaphore
+
+    def _retry_delay(self, host):
+        """
+        Get how long to wait before contacting a host that asked to be retried later.
+
+        Args:
+            host (str): Host name, with port if any
+
+        Returns:
+            float: Seconds to wait, 0 if the host can be contacted now
+        """
+        return max(0.0, self._next_ok_at.get(host, 0.0) - time.monotonic())
+
+    def _note_rate_limit(self, url, host, headers):
+        """
+        Record a 429 response's Retry-After so later requests to the host wait for it.
+
+        Args:
+            url (str): URL that was rate limited
+            host (str): Host name, with port if any
+            headers (Mapping): Case-insensitive response headers
+        """
+        delay = _parse_retry_after(headers.get('Retry-After'))
+        if delay is None:
+            delay = 1.0
+        delay = min(delay, MAX_RETRY_AFTER)
+        logger.warning(f"Rate limited on {url}, pausing requests to {host} for {delay:.1f} seconds")
+        self._next_ok_at[host] = max(self._next_ok_at.get(host, 0.0), time.monotonic() + delay)
+
+    def conditional_headers(self, url, headers):
+        """
+        Add If-None-Match/If-Modified-Since headers for a page fetched before.
+
+        Args:
+            url (str): URL to fetch
+            headers (dict): Request headers for the URL, left unmodified
+
+        Returns:
+            dict: The headers, or a copy with the validators added
+        """
+        with self._state_lock:
+            meta = self.url_meta.get(url)
+        if meta is None:
+            return headers
+
+        etag, last_modified, _, _ = meta
+        headers = dict(headers)
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def cached_content(self, url):
+        """
+        Get the stored body of a page the server reported as not modified.
+
+        Args:
+            url (str): URL that returned 304
+
+        Returns:
+            tuple or None: Stored (html_content, encoding), None if it was evicted meanwhile
+        """
+        with self._state_lock:
+            meta = self.url_meta.get(url)
+            if meta is None:
+                return None
+            self.url_meta.move_to_end(url)
+        return meta[2:]
+
+    def remember_validators(self, url, headers, content, encoding=None):
+        """
+        Store a fetched page with its validators, if the server sent any.
+
+        Args:
+            url (str): Fetched URL
+            headers (Mapping): Case-insensitive response headers
+            content (bytes): HTML content
+            encoding (str): Charset stated by the Content-Type header, if any
+        """
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        with self._state_lock:
+            if not (etag or last_modified):
+                self.url_meta.pop(url, None)
+                return
+            self.url_meta[url] = (etag, last_modified, content, encoding)
+            self.url_meta.move_to_end(url)
+            if len(self.url_meta) > VALIDATOR_CACHE_SIZE:
+                self.url_meta.popitem(last=False)
+
+    def _not_modified(self, url, feed):
+        """
+        Serve a 304 response from the stored page.
+
+        Args:
+            url (str): URL that returned 304
+            feed (callable): Optional callback that receives the stored content as one chunk
+
+        Returns:
+            bytes or None: Stored HTML content, None if it was evicted meanwhile
+        """
+        cached = self.cached_content(url)
+        if cached is None:
+            logger.warning(f"Received 304 for {url} but its content is no longer cached")
+            return None
+
+        content, encoding = cached
+        self.remember_encoding(url, encoding)
+        if feed is not None:
+            feed(content)
+        return content
+
+    def remember_encoding(self, url, encoding):
+        """
+        Record the charset a page's Content-Type header stated, for the parser to read the page with.
+
+        Args:
+            url (str): Fetched URL
+            encoding (str): Stated charset, None if the header gave none
+        """
+        with self._state_lock:
+            if encoding:
+                self.page_encodings[url] = encoding
+            else:
+                self.page_encodings.pop(url, None)
+
+    def build_headers(self, url):
+        """
+        Get the request headers that override the session's DEFAULT_HEADERS for a URL.
+
+        Args:
+            url (str): URL to fetch
+
+        Returns:
+            dict: Shared HTTP headers, empty for most sites; callers must not modify them
+        """
+        # Facebook sites need special handling
+        hostname = cached_urlparse(url).hostname or ''
+        if hostname.endswith(self._FB_DOMAINS):
+            return self._FB_HEADERS
+        return self._NO_HEADERS
+
+    def accepts_response(self, url, headers):
+        """
+        Check response headers before the body is read.
+
+        Args:
+            url (str): URL being fetched
+            headers (Mapping): Case-insensitive response headers
+
+        Returns:
+            bool: False for non-HTML content types or declared sizes over MAX_CONTENT_LENGTH
+        """
+        # A missing Content-Type is allowed, some servers omit it for HTML pages
+        content_type = headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+        if content_type and content_type not in HTML_CONTENT_TYPES:
+            logger.info(f"Skipping {url}: unsupported content type {content_type}")
+            return False
+
+        content_length = headers.get('Content-Length', '')
+        if content_length.isdigit() and int(content_length) > MAX_CONTENT_LENGTH:
+            logger.info(f"Skipping {url}: content length {content_length} exceeds {MAX_CONTENT_LENGTH}")
+            return False
+
+        return True
+
+    def fetch_url(self, url, feed=None):
         """
         Fetch content from a URL.
 
         Args:
             url (str): URL to fetch
+            feed (callable): Optional callback receiving each chunk as it is downloaded
 
         Returns:
-            str or None: HTML content if successful, None otherwise
+            bytes or None: Raw HTML content if successful, None otherwise
         """
 
+        host = cached_urlparse(url).netloc
+        delay = self._retry_delay(host)
+        if delay:
+            time.sleep(delay)
+
         try:
-            # Default headers that work for most sites
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Cache-Control': 'max-age=0'
-            }
-
-            # Special handling for specific sites
-            domain = urlparse(url).netloc.lower()
-
-            # Facebook sites need special handling
-            if 'facebook.com' in domain or 'meta.com' in domain:
-                # Add additional headers that might help with access
-                headers.update({
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.127 Safari/537.36',
-                    'sec-ch-ua': '" Not A;Brand";v="99", "Chromium";v="100", "Google Chrome";v="100"',
-                    'sec-ch-ua-mobile': '?0',
-                    'sec-ch-ua-platform': '"Windows"',
-                    'Sec-Fetch-Dest': 'document',
-                    'Sec-Fetch-Mode': 'navigate',
-                    'Sec-Fetch-Site': 'none',
-                    'Sec-Fetch-User': '?1',
-                    'Referer': 'https://www.google.com/'
-                })
-
-            # Use a session for better performance with connection pooling
-            session = requests.Session()
-
-            # No special cookies needed
-
-            # Set a smaller chunk size for faster initial response
-            response = session.get(
-                url,
-                headers=headers,
-                timeout=self.timeout,
-                stream=True,  # Stream the response
-                allow_redirects=True  # Follow redirects
-            )
-            response.raise_for_status()
-
-            # Only read the first 300KB of content (enough for most documentation pages)
-            content = ""
-            for chunk in response.iter_content(chunk_size=8192, decode_unicode=True):
-                if chunk:
-                    content += chunk
-                # Limit to 300KB to improve performance
-                if len(content) > 300000:
-                    break
+            # Only site-specific overrides and validators are sent per request, the defaults live on the session
+            headers = self.conditional_headers(url, self.build_headers(url))
+
+            # Ask for the first 300KB only; origins that cannot serve the range get the plain request
+            for ranged in (True, False):
+                request_headers = {**headers, **_RANGE_HEADERS} if ranged else headers or None
+                # Closing the response hands its connection back to the session's pool
+                with self._host_semaphore(host), self.session.get(
+                    url,
+                    headers=request_headers,
+                    timeout=self.timeout,
+                    stream=True,  # Stream the response
+                    allow_redirects=True  # Follow redirects
+                ) as response:
+                    if ranged and response.status_code == 416:
+                        continue
+                    if response.status_code == 429:
+                        self._note_rate_limit(url, host, response.headers)
+                    response.raise_for_status()
+                    if response.status_code == 304:
+                        return self._not_modified(url, feed)
+                    if not self.accepts_response(url, response.headers):
+                        return None
+
+                    # Raw bytes are kept for the parser's HTML engine, with the charset if the server stated one;
+                    # requests falls back to ISO-8859-1 for text/html without one, which is left to the parser
+                    encoding = response.encoding if 'charset' in response.headers.get('Content-Type', '').lower() else None
+
+                    # Only read the first 300KB of content (enough for most documentation pages),
+                    # also for origins that ignore the Range header and send the whole page.
+                    buffer = bytearray()
+                    for chunk in response.iter_content(chunk_size=65536):
+                        if chunk:
+                            buffer += chunk
+                            if feed is not None:
+                                feed(chunk)
+                        # Limit to 300KB to improve performance
+                        if len(buffer) > 300000:
+                            break
+                    content = bytes(buffer)
+                    self.remember_encoding(url, encoding)
+                    self.remember_validators(url, response.headers, content, encoding)
+                break
 
             # If we got a very small response, it might be a redirect or anti-bot page
             if len(content) < 500:
@@ -111,58 +470,146 @@ class Crawler:
             logger.error(f"Error fetching URL {url}: {e}")
             return None
 
+    def is_duplicate_content(self, html_content):
+        """
+        Check whether a page's content was already stored under another URL, and remember it if not.
+        Docs often serve one page under several paths, e.g. with and without a trailing slash.
+
+        Args:
+            html_content (bytes or str): HTML content
+
+        Returns:
+            bool: True if an equivalent page was already seen in this crawl
+        """
+        if isinstance(html_content, str):
+            html_content = html_content.encode('utf-8', 'surrogatepass')
+        digest = hashlib.blake2b(_DUPLICATE_NOISE_RE.sub(b'', html_content), digest_size=16).digest()
+
+        with self._state_lock:
+            if digest in self.content_digests:
+                return True
+            self.content_digests.add(digest)
+            return False
+
     def extract_links(self, url, html_content):
         """
         Extract links from HTML content.
 
         Args:
             url (str): Base URL
-            html_content (str): HTML content
+            html_content (bytes or str): HTML content
+
+        Returns:
+            list: List of extracted URLs
+        """
+        if not html_content:
+            return []
+
+        try:
+            # lxml.html directly, links only need hrefs and anchor text
+            tree = lxml.html.document_fromstring(html_content, parser=_html_parser())
+        except Exception as e:
+            logger.error(f"Error extracting links from {url}: {e}")
+            return []
+
+        return self.extract_links_from_tree(url, tree)
+
+    def fetch_and_extract(self, url):
+        """
+        Fetch a URL and extract its links, parsing the HTML while it downloads
+        instead of in a second pass over the finished page.
+
+        Args:
+            url (str): URL to fetch
+
+        Returns:
+            tuple: (html_content, extracted_links), html_content being None on failure
+        """
+        # A fresh parser per page, since feeding keeps document state between calls
+        parser = lxml.html.HTMLParser()
+        html_content = self.fetch_url(url, feed=parser.feed)
+        if not html_content:
+            return None, []
+
+        return html_content, self.extract_links_from_parser(url, parser)
+
+    def extract_links_from_parser(self, url, parser):
+        """
+        Finish a parser that was fed a page while it downloaded and extract the page's links.
+
+        Args:
+            url (str): Base URL
+            parser (lxml.html.HTMLParser): Parser fed with the page's content
 
         Returns:
             list: List of extracted URLs
         """
-        links = []
         try:
-            # Use a faster parser
-            soup = BeautifulSoup(html_content, 'lxml')
+            tree = parser.close()
+        except Exception as e:
+            logger.error(f"Error extracting links from {url}: {e}")
+            return []
+
+        return self.extract_links_from_tree(url, tree)
+
+    def extract_links_from_tree(self, url, tree):
+        """
+        Extract links from a parsed HTML document.
+
+        Args:
+            url (str): Base URL
+            tree (lxml.html.HtmlElement): Root element of the document
 
+        Returns:
+            list: List of extracted URLs
+        """
+        links = []
+        try:
             # Focus on the main content area for links
-            main_content = soup.select_one('main, #main, .main, #content, .content, article, .article, .documentation, #documentation')
-            if not main_content:
-                main_content = soup
+            main_content = tree.xpath(_MAIN_CONTENT_XPATH)
+            main_content = main_content[0] if main_content else tree
 
             # Prioritize links that are likely to be documentation pages
             priority_links = []
             normal_links = []
 
+            # Parse the base URL once; absolute and root-relative hrefs skip urljoin
+            base = cached_urlparse(url)
+            base_origin = f"{base.scheme}://{base.netloc}"
+            is_same_host = make_same_domain_checker(url)
+
             # Look for links in the main content
-            for a_tag in main_content.find_all('a', href=True, limit=100):  # Limit to 100 links for performance
-                href = a_tag['href']
+            a_tags = (a_tag for a_tag in main_content.iterdescendants('a') if a_tag.get('href') is not None)
+            for a_tag in islice(a_tags, 100):  # Limit to 100 links for performance
+                href = a_tag.get('href')
                 # Skip empty links, javascript links, and anchors
                 if not href or href.startswith(('javascript:', '#', 'mailto:', 'tel:')):
                     continue
 
-                # Convert relative URLs to absolute
-                absolute_url = urljoin(url, href)
+                # Convert relative URLs to absolute; paths with dot segments still need urljoin to resolve them
+                if href.startswith(('http://', 'https://')):
+                    absolute_url = href
+                elif href.startswith('/') and not href.startswith('//') and '/.' not in href:
+                    absolute_url = base_origin + href
+                else:
+                    absolute_url = urljoin(url, href)
                 # Normalize the URL
                 normalized_url = normalize_url(absolute_url)
 
-                # Only include links from the same domain
-                if is_same_domain(url, normalized_url) and is_valid_url(normalized_url):
+                # Only include web links from the same host (the base netloc is never empty)
+                if is_same_host(normalized_url):
                     # Check if this is likely a documentation page
-                    link_text = a_tag.get_text().lower()
-                    if any(keyword in normalized_url.lower() or keyword in link_text for keyword in
-                          ['doc', 'api', 'reference', 'guide', 'manual', 'tutorial', 'module', 'class', 'function']):
+                    if _DOC_KW_RE.search(normalized_url) or _DOC_KW_RE.search(a_tag.text_content()):
                         priority_links.append(normalized_url)
-                    else:
+                        # Later links cannot make the cut once there are enough priority links
+                        if len(priority_links) >= MAX_LINKS_PER_PAGE:
+                            break
+                    elif len(normal_links) < MAX_LINKS_PER_PAGE:
                         normal_links.append(normalized_url)
 
-            # Combine priority links first, then normal links
-            links = priority_links + normal_links
-
-            # Limit the number of links to avoid excessive crawling
-            return links[:50]  # Return at most 50 links
+            # Combine priority links first, then normal links, returning at most MAX_LINKS_PER_PAGE links
+            # to avoid excessive crawling
+            return (priority_links + normal_links)[:MAX_LINKS_PER_PAGE]
 
         except Exception as e:
             logger.error(f"Error extracting links from {url}: {e}")
@@ -183,27 +630,33 @@ class Crawler:
         success = False
 
         try:
-            # Skip if we've reached max depth or already visited
-            if depth > self.max_depth or url in self.visited_urls:
-                return (url, None, [], depth)
-
-            # Mark as visited to prevent concurrent threads from processing it again
-            self.visited_urls.add(url)
-
-            # Increment the pages crawled counter
-            self.pages_crawled += 1
-
-            # Fetch the page content
-            html_content = self.fetch_url(url)
+            # Check and mark as visited in one step, so concurrent threads never fetch the same URL twice
+            with self._state_lock:
+                # Skip if we've reached max depth or already visited
+                if depth > self.max_depth or not self.visited_bloom.add(url):
+                    return (url, None, [], depth)
+
+                # Increment the pages crawled counter
+                self.pages_crawled += 1
+
+            # Fetch the page content, extracting links while it downloads unless the
+            # page is at max depth and its links would not be followed
+            if depth < self.max_depth:
+                html_content, links = self.fetch_and_extract(url)
+            else:
+                html_content, links = self.fetch_url(url), []
             if not html_content:
                 return (url, None, [], depth)
 
-            # Extract links from the page
-            links = self.extract_links(url, html_content)
+            # Don't store a page seen under another URL, but still follow its links
+            if self.is_duplicate_content(html_content):
+                logger.info(f"Skipping duplicate content at {url}")
+                return (url, None, links, depth)
 
             # Mark as successful and increment the successful pages counter
             success = True
-            self.successful_pages += 1
+            with self._state_lock:
+                self.successful_pages += 1
 
             return (url, html_content, links, depth)
 
@@ -219,7 +672,7 @@ class Crawler:
             start_url (str): Starting URL
 
         Returns:
-            dict: Dictionary of crawled pages {url: html_content}
+            dict: Dictionary of crawled pages {url: html_bytes}
         """
         # Check if URL is valid
         if not is_valid_url(start_url):
@@ -230,44 +683,272 @@ class Crawler:
         start_url = normalize_url(start_url)
 
         # Initialize with the start URL
-        self.links_to_crawl = [(start_url, 0)]  # (url, depth)
+        self.links_to_crawl = deque([(start_url, 0)])  # (url, depth)
 
         # Process URLs in parallel until we've reached max pages or have no more links
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            while self.links_to_crawl and len(self.pages) < self.max_pages:
-                # Take a batch of URLs to process
-                batch = self.links_to_crawl[:self.max_workers]
-                self.links_to_crawl = self.links_to_crawl[self.max_workers:]
+        pool = nullcontext(self.executor) if self.executor else concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        with pool as executor:
+            pending = set()
+            while True:
+                # Keep up to max_workers fetches in flight, refilling as soon as any one finishes
+                # rather than waiting for the slowest URL of a batch
+                while self.links_to_crawl and len(pending) < self.max_workers and len(self.pages) < self.max_pages:
+                    pending.add(executor.submit(self.process_url, self.links_to_crawl.popleft()))
+                if not pending:
+                    break
 
-                # Process the batch in parallel
-                future_to_url = {executor.submit(self.process_url, url_info): url_info for url_info in batch}
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
 
                 # Collect results and add new links to crawl
-                for future in concurrent.futures.as_completed(future_to_url):
+                for future in done:
                     url, html_content, links, depth = future.result()
 
                     # Store the page content if it was successfully fetched
+                    # (only this coordinating thread writes self.pages, so it needs no lock)
                     if html_content:
                         self.pages[url] = html_content
 
-                        # Add new links to crawl
-                        new_depth = depth + 1
-                        if new_depth <= self.max_depth:
-                            for link in links:
-                                if link not in self.visited_urls and len(self.pages) < self.max_pages:
-                                    self.links_to_crawl.append((link, new_depth))
+                    # Add new links to crawl, including those of duplicate pages that were not stored
+                    new_depth = depth + 1
+                    if new_depth <= self.max_depth:
+                        for link in links:
+                            if link not in self.visited_bloom and len(self.pages) < self.max_pages:
+                                self.links_to_crawl.append((link, new_depth))
+
+        return self.pages
+
+    async def fetch_url_async(self, session, semaphore, url, feed=None):
+        """
+        Fetch content from a URL with aiohttp.
+
+        Args:
+            session (aiohttp.ClientSession): Shared client session
+            semaphore (asyncio.Semaphore): Bounds the number of concurrent fetches
+            url (str): URL to fetch
+            feed (callable): Optional callback receiving each chunk as it is downloaded
+
+        Returns:
+            bytes or None: Raw HTML content if successful, None otherwise
+        """
+        host = cached_urlparse(url).netloc
+        delay = self._retry_delay(host)
+        if delay:
+            await asyncio.sleep(delay)
+
+        async with semaphore:
+            try:
+                headers = self.conditional_headers(url, self.build_headers(url))
+
+                # Ask for the first 300KB only; origins that cannot serve the range get the plain request
+                for ranged in (True, False):
+                    request_headers = {**headers, **_RANGE_HEADERS} if ranged else headers or None
+                    async with session.get(url, headers=request_headers) as response:
+                        if ranged and response.status == 416:
+                            continue
+                        if response.status == 429:
+                            self._note_rate_limit(url, host, response.headers)
+                        response.raise_for_status()
+                        if response.status == 304:
+                            return self._not_modified(url, feed)
+                        if not self.accepts_response(url, response.headers):
+                            return None
+
+                        # Only read the first 300KB of content, like fetch_url
+                        chunks = []
+                        size = 0
+                        async for chunk in response.content.iter_chunked(65536):
+                            chunks.append(chunk)
+                            size += len(chunk)
+                            if feed is not None:
+                                feed(chunk)
+                            if size > 300000:
+                                break
+
+                        content = b"".join(chunks)
+                        # aiohttp's charset is None unless the Content-Type header states one
+                        self.remember_encoding(url, response.charset)
+                        self.remember_validators(url, response.headers, content, response.charset)
+                    break
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error(f"Error fetching URL {url}: {e}")
+                return None
+
+        if len(content) < 500:
+            logger.warning(f"Received very small response from {url}, this might be a redirect or anti-bot page")
+
+        return content
+
+    async def crawl_async(self, start_url, with_encodings=False):
+        """
+        Crawl a website with asyncio and aiohttp, with max_workers tasks draining a queue of links.
+        Falls back to crawl_parallel when aiohttp is not installed.
+
+        Args:
+            start_url (str): Starting URL
+            with_encodings (bool): If True, also return the charsets stated by the pages' Content-Type headers
+
+        Returns:
+            dict or tuple: Dictionary of crawled pages {url: html_bytes}, or (pages, {url: charset})
+                if with_encodings is True
+        """
+        if aiohttp is None:
+            logger.warning("aiohttp is not installed, falling back to threaded crawling")
+            return self._crawl_threaded(start_url, with_encodings)
+
+        # Each caller runs its own event loop in its own thread, so blocking here only
+        # waits for another thread's crawl on this instance to finish
+        with self._crawl_lock:
+            self.reset()
+            return self._crawl_result(await self._crawl_queue(start_url), with_encodings)
+
+    def _crawl_result(self, pages, with_encodings):
+        """
+        Build a crawl's return value while the crawl lock is held, before another crawl can reset the state.
+
+        Args:
+            pages (dict): Dictionary of crawled pages {url: html_bytes}
+            with_encodings (bool): If True, also return the stated charsets of the pages
+
+        Returns:
+            dict or tuple: The pages, or (pages, {url: charset}) with a copy of page_encodings for the pages
+        """
+        if not with_encodings:
+            return pages
+        with self._state_lock:
+            encodings = {url: self.page_encodings[url] for url in pages if url in self.page_encodings}
+        return pages, encodings
+
+    async def _crawl_queue(self, start_url):
+        """
+        Run the queue-driven crawl for crawl_async.
+
+        Args:
+            start_url (str): Starting URL
+
+        Returns:
+            dict: Dictionary of crawled pages {url: html_bytes}
+        """
+        # Check if URL is valid
+        if not is_valid_url(start_url):
+            logger.error(f"Invalid URL: {start_url}")
+            return self.pages
+
+        start_url = normalize_url(start_url)
+        self.visited_bloom.add(start_url)
+        queue = asyncio.Queue()
+        queue.put_nowait((start_url, 0))
+
+        semaphore = asyncio.Semaphore(self.max_workers)
+        connector = aiohttp.TCPConnector(limit=self.max_workers, limit_per_host=self.max_per_host, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=_ASYNC_HEADERS) as session:
+            budget = asyncio.Condition()
+            workers = [asyncio.create_task(self._crawl_worker(session, semaphore, queue, budget))
+                       for _ in range(self.max_workers)]
+            # Every queued link has been processed once the queue is joined
+            await queue.join()
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
 
         return self.pages
 
-    def crawl(self, start_url):
+    async def _crawl_worker(self, session, semaphore, queue, budget):
+        """
+        Process queued (url, depth) links until cancelled.
+
+        Args:
+            session (aiohttp.ClientSession): Shared client session
+            semaphore (asyncio.Semaphore): Bounds the number of concurrent fetches
+            queue (asyncio.Queue): Queue of (url, depth) links, each marked as seen when queued
+            budget (asyncio.Condition): Notified whenever an in-flight fetch finishes
+        """
+        while True:
+            url, depth = await queue.get()
+            try:
+                # Fetches in flight reserve part of the page budget; wait for them to finish
+                # rather than dropping links that might still be needed if they fail
+                async with budget:
+                    await budget.wait_for(lambda: len(self.pages) + self._in_flight < self.max_pages
+                                          or len(self.pages) >= self.max_pages)
+                    if len(self.pages) >= self.max_pages:
+                        continue
+                    self._in_flight += 1
+
+                try:
+                    await self._process_url_async(session, semaphore, queue, url, depth)
+                finally:
+                    async with budget:
+                        self._in_flight -= 1
+                        budget.notify_all()
+            except Exception as e:
+                logger.error(f"Error processing URL {url}: {e}")
+            finally:
+                queue.task_done()
+
+    async def _process_url_async(self, session, semaphore, queue, url, depth):
+        """
+        Fetch a page, store it unless it duplicates another page, and queue its unseen links.
+
+        Args:
+            session (aiohttp.ClientSession): Shared client session
+            semaphore (asyncio.Semaphore): Bounds the number of concurrent fetches
+            queue (asyncio.Queue): Queue of (url, depth) links
+            url (str): URL to fetch
+            depth (int): Depth of the URL
+        """
+        self.pages_crawled += 1
+
+        # Pages whose links will be followed are parsed while they download
+        parser = lxml.html.HTMLParser() if depth < self.max_depth else None
+        html_content = await self.fetch_url_async(session, semaphore, url, feed=parser.feed if parser else None)
+        if not html_content:
+            return
+
+        # Don't store a page seen under another URL, but still follow its links
+        if self.is_duplicate_content(html_content):
+            logger.info(f"Skipping duplicate content at {url}")
+        else:
+            self.pages[url] = html_content
+            self.successful_pages += 1
+
+        if parser is not None:
+            for link in self.extract_links_from_parser(url, parser):
+                if self.visited_bloom.add(link):
+                    queue.put_nowait((link, depth + 1))
+
+    def _crawl_threaded(self, start_url, with_encodings=False):
+        """
+        Run crawl_parallel on a fresh crawl state.
+
+        Args:
+            start_url (str): Starting URL
+            with_encodings (bool): If True, also return the charsets stated by the pages' Content-Type headers
+
+        Returns:
+            dict or tuple: Dictionary of crawled pages {url: html_bytes}, or (pages, {url: charset})
+        """
+        with self._crawl_lock:
+            self.reset()
+            return self._crawl_result(self.crawl_parallel(start_url), with_encodings)
+
+    def crawl(self, start_url, with_encodings=False):
         """
         Crawl a website starting from a given URL.
-        This is a wrapper around crawl_parallel for backward compatibility.
+        Runs crawl_async on a new event loop when aiohttp is installed, and crawl_parallel otherwise,
+        so it must not be called from a running event loop.
+        State from a previous crawl is cleared first and the session stays open,
+        so the instance and its connection pool can be reused.
 
         Args:
             start_url (str): Starting URL
+            with_encodings (bool): If True, also return the charsets stated by the pages' Content-Type headers
 
         Returns:
-            dict: Dictionary of crawled pages {url: html_content}
+            dict or tuple: Dictionary of crawled pages {url: html_bytes}, or (pages, {url: charset})
+                if with_encodings is True
         """
-        return self.crawl_parallel(start_url)
+        if aiohttp is None:
+            return self._crawl_threaded(start_url, with_encodings)
+        return asyncio.run(self.crawl_async(start_url, with_encodings))
@@ -0,0 +1,24 @@
+"""
+Shared worker pools for the crawler and the parser.
+"""
+import concurrent.futures
+import logging
+from functools import lru_cache
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=None)
+def get_pool(max_workers):
+    """
+    Get a process-wide thread pool with the given number of workers.
+    The pool is created on first use and reused by every later caller.
+
+    Args:
+        max_workers (int): Number of worker threads
+
+    Returns:
+        concurrent.futures.ThreadPoolExecutor: Shared thread pool
+    """
+    logger.info(f"Creating shared thread pool with {max_workers} workers")
+    return concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
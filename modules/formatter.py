@@ -4,9 +4,153 @@ JSON output formatting functionality.
 import json
 import logging
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Placeholder for modules and submodules without a description
+NO_DESCRIPTION = "No description available"
+
+
+class FormattedModule:
+    """
+    A module in the output schema. Uses __slots__ and keeps submodules as (name, description)
+    pairs, so large results take far less memory than nested dicts until they are serialized.
+    """
+
+    __slots__ = ("module", "description", "submodules")
+
+    def __init__(self, module, description, submodules):
+        """
+        Initialize the formatted module.
+
+        Args:
+            module (str): Module name
+            description (str): Module description
+            submodules (list): List of (name, description) tuples
+        """
+        self.module = module
+        self.description = description
+        self.submodules = submodules
+
+    def to_dict(self):
+        """
+        Convert to the output schema.
+
+        Returns:
+            dict: {"module": ..., "Description": ..., "Submodules": {name: description}}
+        """
+        return {
+            "module": self.module,
+            "Description": self.description,
+            "Submodules": dict(self.submodules)
+        }
+
+def _json_default(obj):
+    """
+    Serialize objects the JSON encoders do not handle natively.
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        dict: JSON-serializable representation
+
+    Raises:
+        TypeError: If the object type is not supported
+    """
+    if isinstance(obj, FormattedModule):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def format_modules(modules):
+    """
+    Normalize parsed modules into the output schema, skipping modules without a name.
+    Accepts both "Description"/"Submodules" and lowercase "description"/"submodules" keys.
+
+    Args:
+        modules (list): List of module dictionaries
+
+    Returns:
+        tuple: (formatted_modules, total_submodules), formatted_modules being a list of FormattedModule
+    """
+    # Bind hot names locally to keep the loop cheap on large sites
+    _str = str
+    _dict = dict
+    _formatted = FormattedModule
+    formatted_modules = []
+    append = formatted_modules.append
+    total_submodules = 0
+
+    for module in modules:
+        name = module.get("module")
+        if not name:
+            continue
+
+        submodules = module.get("Submodules") or module.get("submodules") or {}
+        if not isinstance(submodules, _dict):
+            submodules = {}
+
+        cleaned_submodules = [(_str(sub_name), _str(sub_desc) if sub_desc else NO_DESCRIPTION)
+                              for sub_name, sub_desc in submodules.items() if sub_name]
+        total_submodules += len(cleaned_submodules)
+
+        append(_formatted(
+            _str(name),
+            _str(module.get("Description") or module.get("description") or NO_DESCRIPTION),
+            cleaned_submodules
+        ))
+
+    return formatted_modules, total_submodules
+
+def dumps_json(data, indent=2):
+    """
+    Serialize data to a JSON string, using orjson when it supports the requested indentation.
+    orjson only indents by two spaces, so other indent levels use the standard library, which
+    also writes non-ASCII text unescaped.
+
+    Args:
+        data: JSON-serializable data, which may contain FormattedModule objects
+        indent (int): Indentation level, or None for compact output
+
+    Returns:
+        str: JSON string
+    """
+    if orjson is not None and indent in (None, 2):
+        try:
+            return orjson.dumps(data, default=_json_default, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+        except TypeError:
+            # orjson rejects some inputs the standard library accepts, e.g. non-string keys
+            pass
+
+    # Non-ASCII text is written as is, like orjson does, instead of as \u escapes
+    return json.dumps(data, indent=indent, default=_json_default, ensure_ascii=False)
+
+def dumps_json_bytes(data, indent=2):
+    """
+    Serialize data to UTF-8 encoded JSON, without building an intermediate str when orjson is available.
+
+    Args:
+        data: JSON-serializable data, which may contain FormattedModule objects
+        indent (int): Indentation level, or None for compact output
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None and indent in (None, 2):
+        try:
+            return orjson.dumps(data, default=_json_default, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            # orjson rejects some inputs the standard library accepts, e.g. non-string keys
+            pass
+
+    return json.dumps(data, indent=indent, default=_json_default, ensure_ascii=False).encode("utf-8")
+
+
 class Formatter:
     """
     Formatter for JSON output.
@@ -26,32 +170,18 @@ class Formatter:
             modules (list): List of module dictionaries
 
         Returns:
-            list: Formatted list of module dictionaries
+            list: Formatted list of new module dictionaries, which callers may modify without affecting the input
         """
-        formatted_modules = []
+        formatted_modules = [None] * len(modules)
 
-        for module in modules:
-            formatted_module = {
+        for i, module in enumerate(modules):
+            # Clean up empty descriptions and submodule descriptions
+            formatted_modules[i] = {
                 "module": module.get("module", ""),
-                "Description": module.get("Description", ""),
-                "Submodules": module.get("Submodules", {})
+                "Description": module.get("Description") or NO_DESCRIPTION,
+                "Submodules": {name: desc or NO_DESCRIPTION for name, desc in module.get("Submodules", {}).items()}
             }
 
-            # Clean up empty descriptions
-            if not formatted_module["Description"]:
-                formatted_module["Description"] = "No description available"
-
-            # Clean up submodules
-            cleaned_submodules = {}
-            for submodule_name, submodule_desc in formatted_module["Submodules"].items():
-                if not submodule_desc:
-                    submodule_desc = "No description available"
-                cleaned_submodules[submodule_name] = submodule_desc
-
-            formatted_module["Submodules"] = cleaned_submodules
-
-            formatted_modules.append(formatted_module)
-
         return formatted_modules
 
     def to_json(self, modules, indent=1):
@@ -69,7 +199,7 @@ class Formatter:
             formatted_modules = self.format_modules(modules)
 
             # For standard JSON compatibility, we'll use a list of modules
-            return json.dumps(formatted_modules, indent=indent)
+            return dumps_json(formatted_modules, indent=indent)
 
         except Exception as e:
             logger.error(f"Error converting to JSON: {e}")
@@ -90,27 +220,27 @@ class Formatter:
         try:
             formatted_modules = self.format_modules(modules)
 
-            # Create the exact format needed with opening and closing braces
-            json_str = "{\n"
+            # Collect the pieces and join once, instead of growing one string per module
+            parts = ["{\n"]
+            last = len(formatted_modules) - 1
 
             # Add each module
             for i, module in enumerate(formatted_modules):
-                module_json = json.dumps(module, indent=indent)
-
-                # Format the module JSON to match the required format
-                # Replace the opening and closing braces with the required format
-                module_json = " {\n" + "\n".join(module_json.split("\n")[1:-1]) + "\n }"
+                module_json = dumps_json(module, indent=indent)
 
+                # Replace the opening and closing braces with the required format,
+                # slicing out the lines between them rather than splitting every line
+                start = module_json.find("\n") + 1
+                end = module_json.rfind("\n")
+                parts.append(" {\n")
+                parts.append(module_json[start:end] if start else "")
                 # Add comma if not the last module
-                if i < len(formatted_modules) - 1:
-                    module_json += ","
-
-                json_str += module_json + "\n"
+                parts.append("\n },\n" if i < last else "\n }\n")
 
             # Close the JSON string
-            json_str += "}"
+            parts.append("}")
 
-            return json_str
+            return "".join(parts)
 
         except Exception as e:
             logger.error(f"Error converting to custom format: {e}")
@@ -2,37 +2,241 @@
 HTML parsing and module extraction functionality.
 """
 import logging
+import codecs
 import concurrent.futures
+import functools
+import hashlib
+import multiprocessing
+import os
 import re
-from bs4 import BeautifulSoup
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+from itertools import islice
+import lxml.html
+from lxml import etree
 from .utils import clean_text
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # selectolax is optional
+    LexborHTMLParser = None
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# lxml parsers must not be shared between threads, so each thread gets its own
+_thread_local = threading.local()
+
+# Number of parsed pages remembered by each Parser, keyed by content hash
+PARSE_CACHE_SIZE = 256
+
+# Parse workers by default: one process per core, leaving one core for the caller
+DEFAULT_PARSE_WORKERS = max((os.cpu_count() or 2) - 1, 1)
+
+# Batches smaller than this are parsed inline, since starting worker processes would cost more than it saves
+MIN_PROCESS_BATCH = 4
+
+# Heading and list item elements parsed per page; a page is cut before the next one's start tag
+MAX_PAGE_ELEMENTS = 1000
+
+# Submodule detection patterns
+SUBMODULE_PATTERNS = [
+    # Common patterns for submodule names
+    r'(?:sub|child)[\s\-_]?modules?',
+    r'components?',
+    r'features?',
+    r'functions?',
+    r'methods?',
+    r'properties?',
+    r'attributes?',
+    r'parameters?',
+    r'options?',
+    r'settings?',
+    r'configurations?',
+    r'apis?',
+    r'endpoints?',
+    r'services?',
+    r'utilities?',
+    r'helpers?',
+    r'tools?',
+    r'plugins?',
+    r'extensions?',
+    r'add-?ons?'
+]
+
+# Common submodule keywords for documentation sites
+SUBMODULE_KEYWORDS = (
+    'feature', 'tool', 'setting', 'option', 'preference', 'configuration',
+    'function', 'method', 'property', 'attribute', 'parameter',
+    'api', 'endpoint', 'service', 'utility', 'helper',
+    'component', 'element', 'widget', 'control',
+    'page', 'screen', 'view', 'section', 'panel',
+    'create', 'edit', 'delete', 'manage', 'configure',
+    'upload', 'download', 'share', 'publish', 'post',
+    'privacy', 'security', 'permission', 'access', 'role',
+    'notification', 'alert', 'message', 'comment', 'feedback',
+    'profile', 'account', 'user', 'group', 'team',
+    'search', 'filter', 'sort', 'browse', 'navigate',
+    'import', 'export', 'backup', 'restore', 'sync',
+    'report', 'analytics', 'statistics', 'metric', 'dashboard',
+    'schedule', 'calendar', 'event', 'reminder', 'notification',
+    'payment', 'subscription', 'billing', 'invoice', 'transaction',
+    'integration', 'connection', 'plugin', 'extension', 'add-on'
+)
+
+# Regular expressions shared by all Parser instances and pages
+_WHITESPACE_RE = re.compile(r'\s+')
+_SUBMODULE_RE = re.compile('|'.join(SUBMODULE_PATTERNS), re.IGNORECASE)
+
+# Start tags of the elements counted against MAX_PAGE_ELEMENTS, for byte and str pages
+_STRUCTURE_TAG_RE = re.compile(rb'<(?:h[1-6]|li)[\s>]', re.IGNORECASE)
+_STRUCTURE_TAG_STR_RE = re.compile(r'<(?:h[1-6]|li)[\s>]', re.IGNORECASE)
+
+# Charset declarations that libxml2 honours; other byte pages are read with the charset their
+# Content-Type header stated, or as UTF-8 when valid
+_CHARSET_DECLARATION_RE = re.compile(rb'<meta[^>]+charset|<\?xml[^>]+encoding', re.IGNORECASE)
+_BOMS = (codecs.BOM_UTF8, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+
+# First <dd>/<p> after an element's subtree, for elements with none left inside their container
+_FOLLOWING_XPATHS = {
+    'dd': etree.XPath('following::dd[1]'),
+    'p': etree.XPath('following::p[1]'),
+}
+
+# Tags of the elements find_submodules_aggressively looks at, mapped to their kind of candidate
+_AGGRESSIVE_CANDIDATE_KINDS = {
+    'table': 'table',
+    'dl': 'dl',
+    'div': 'block',
+    'section': 'block',
+    'ul': 'list',
+    'ol': 'list',
+    'pre': 'code',
+    'code': 'code',
+}
+
+# Declarations like "function X" or "method Y" in code blocks, with the label used for their description
+_CODE_DECLARATION_RES = [
+    (re.compile(rf'{keyword}\s+([a-zA-Z0-9_]+)', re.IGNORECASE), keyword.capitalize())
+    for keyword in ['function', 'method', 'class', 'property', 'attribute', 'parameter', 'option', 'setting', 'feature']
+]
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_keyword_union(keywords, flags=0):
+    """
+    Compile a regex that finds any of the keywords as a substring. The alternation is factored
+    into a prefix tree, so the regex engine tests each shared prefix once instead of every keyword.
+
+    Args:
+        keywords (tuple): Keywords, matched literally
+        flags (int): Regex flags, e.g. re.IGNORECASE
+
+    Returns:
+        re.Pattern: Compiled regex
+    """
+    # A keyword containing another keyword can never be the only match, so it is left out
+    keywords = set(keywords)
+    keywords = [keyword for keyword in keywords
+                if not any(other != keyword and other in keyword for other in keywords)]
+
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[None] = None
+
+    def alternation(node):
+        branches = [re.escape(char) + alternation(child) for char, child in sorted(node.items(), key=lambda item: item[0] or '')
+                    if char is not None]
+        if not branches:
+            return ''
+        return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+
+    return re.compile(alternation(trie), flags)
+
+
+# Class attribute keywords of elements the extraction looks for, matched case-insensitively as substrings
+# Elements used as headings on pages without h1-h6
+_HEADING_CLASS_RE = _compile_keyword_union(('title', 'heading', 'header', 'module', 'section'), re.IGNORECASE)
+# Levels of such headings
+_TITLE_CLASS_RE = _compile_keyword_union(('title',), re.IGNORECASE)
+_SUBTITLE_CLASS_RE = _compile_keyword_union(('subtitle',), re.IGNORECASE)
+_SECTION_CLASS_RE = _compile_keyword_union(('section',), re.IGNORECASE)
+# Lists and menus that may list modules, and their items
+_LIST_CLASS_RE = _compile_keyword_union(('menu', 'nav', 'list', 'toc', 'index', 'modules'), re.IGNORECASE)
+_LIST_ITEM_CLASS_RE = _compile_keyword_union(('item', 'entry', 'module', 'link'), re.IGNORECASE)
+# Large lists that are still module lists
+_MODULE_LIST_CLASS_RE = _compile_keyword_union(('module', 'api', 'doc', 'toc'), re.IGNORECASE)
+# Elements holding an item's name or description
+_NAME_CLASS_RE = _compile_keyword_union(('title', 'name', 'module'), re.IGNORECASE)
+_DESCRIPTION_CLASS_RE = _compile_keyword_union(('desc', 'summary', 'info'), re.IGNORECASE)
+# Nested lists holding submodules
+_NESTED_LIST_CLASS_RE = _compile_keyword_union(('submenu', 'children', 'nested', 'sub'), re.IGNORECASE)
+# Sections that may describe submodules, and help sections
+_SUBMODULE_SECTION_CLASS_RE = _compile_keyword_union(('api', 'method', 'function', 'property', 'feature', 'tool', 'setting'), re.IGNORECASE)
+_HELP_CLASS_RE = _compile_keyword_union(('help', 'faq', 'guide', 'tutorial', 'howto', 'how-to'), re.IGNORECASE)
+
+# Quick mode parses pages whose URL mentions one of these first
+_URL_PRIORITY_RE = _compile_keyword_union(('api', 'doc', 'reference', 'module', 'class'), re.IGNORECASE)
+
+
 class Parser:
     """
     Parser for extracting modules and submodules from HTML content.
     """
 
-    def __init__(self, max_workers=5, quick_mode=False, aggressive_submodule_detection=False):
+    def __init__(self, max_workers=DEFAULT_PARSE_WORKERS, quick_mode=False, aggressive_submodule_detection=False,
+                 backend=None, use_processes=True):
         """
         Initialize the parser.
 
         Args:
-            max_workers (int): Maximum number of worker threads for parallel parsing
+            max_workers (int): Maximum number of worker processes (or threads) for parallel parsing
             quick_mode (bool): If True, use faster but less detailed parsing
             aggressive_submodule_detection (bool): If True, use more aggressive techniques to find submodules
+            backend (str): "lxml" for lxml's libxml2 parser, or "lexbor" for selectolax's Lexbor engine.
+                The lexbor backend only extracts modules from headings and lists, so it ignores
+                aggressive_submodule_detection. Defaults to lexbor in quick mode without aggressive
+                submodule detection when selectolax is installed, and to lxml otherwise.
+            use_processes (bool): If True, parse batches in a process pool, so tree walking is not
+                serialized by the GIL; batches under MIN_PROCESS_BATCH pages, or a single worker, parse inline.
+                The pool is started on first use and kept until close(). If False, parse in threads.
         """
         self.modules = []
         self.max_workers = max_workers
+        self.use_processes = use_processes
         self.quick_mode = quick_mode
         self.aggressive_submodule_detection = aggressive_submodule_detection
+
+        # Quick mode trades detail for speed, so it prefers the faster Lexbor engine, unless
+        # aggressive submodule detection is requested, which only the lxml backend implements
+        if backend is None:
+            use_lexbor = quick_mode and not aggressive_submodule_detection and LexborHTMLParser is not None
+            backend = "lexbor" if use_lexbor else "lxml"
+        elif backend == "lexbor" and aggressive_submodule_detection:
+            logger.warning("The lexbor backend does not support aggressive submodule detection; it will be ignored")
+
+        # Fall back to lxml if selectolax is not installed
+        if backend == "lexbor" and LexborHTMLParser is None:
+            logger.warning("selectolax is not installed, falling back to the lxml backend")
+            backend = "lxml"
+        self.backend = backend
         self.pages_processed = 0
         self.modules_found = 0
 
-        # Compile regular expressions for faster text processing
-        self.whitespace_regex = re.compile(r'\s+')
+        # Process pool shared by every batch, started on first use
+        self._process_pool = None
+        self._process_pool_lock = threading.Lock()
+
+        # LRU cache of parse results keyed by a hash of the page content
+        self._parse_cache = OrderedDict()
+        self._parse_cache_lock = threading.Lock()
+
+        # Compiled regular expressions for faster text processing
+        self.whitespace_regex = _WHITESPACE_RE
 
         # Common non-content selectors - more aggressive in quick mode
         if quick_mode:
@@ -43,71 +247,58 @@ class Parser:
         # Main content selectors
         self.main_content_selectors = 'main, #main, .main, #content, .content, article, .article, .documentation, #documentation'
 
-        # Submodule detection patterns
-        self.submodule_patterns = [
-            # Common patterns for submodule names
-            r'(?:sub|child)[\s\-_]?modules?',
-            r'components?',
-            r'features?',
-            r'functions?',
-            r'methods?',
-            r'properties?',
-            r'attributes?',
-            r'parameters?',
-            r'options?',
-            r'settings?',
-            r'configurations?',
-            r'apis?',
-            r'endpoints?',
-            r'services?',
-            r'utilities?',
-            r'helpers?',
-            r'tools?',
-            r'plugins?',
-            r'extensions?',
-            r'add-?ons?'
-        ]
-
-        # Compile the patterns
-        self.submodule_regex = re.compile('|'.join(self.submodule_patterns), re.IGNORECASE)
-
-    def extract_content(self, html):
+        # The selectors compiled to XPath once, since lxml evaluates those in C
+        self.non_content_xpath = _selector_xpath(self.non_content_selectors)
+        self.main_content_xpath = _selector_xpath(self.main_content_selectors)
+
+        # Submodule detection patterns, compiled once at import time
+        self.submodule_patterns = SUBMODULE_PATTERNS
+        self.submodule_regex = _SUBMODULE_RE
+
+        # Substring test for any of the submodule keywords, in one regex scan instead of one per keyword
+        self.submodule_keyword_regex = _compile_keyword_union(SUBMODULE_KEYWORDS)
+
+    def extract_content(self, html, encoding=None):
         """
         Extract the main content from HTML, removing navigation, headers, footers, etc.
 
         Args:
-            html (str): HTML content
+            html (bytes or str): HTML content
+            encoding (str): Charset stated by the page's Content-Type header, if any
 
         Returns:
-            BeautifulSoup: BeautifulSoup object with main content
+            lxml.html.HtmlElement or None: Element with the main content, None for empty documents
         """
         try:
-            # Use lxml parser for faster parsing
-            soup = BeautifulSoup(html, 'lxml')
+            tree = _html_document(html, encoding)
 
-            # Remove common non-content elements in one go
-            for element in soup.select(self.non_content_selectors):
-                element.decompose()
+            # Remove common non-content elements in one go, keeping the text that follows them
+            for element in self.non_content_xpath(tree):
+                element.drop_tree()
 
             # Try to find the main content using a single selector
-            main_content = soup.select_one(self.main_content_selectors)
+            main_content = self.main_content_xpath(tree)
 
             # If main content is found, use it; otherwise, use the whole body
             if main_content:
-                return main_content
+                return main_content[0]
             else:
-                # If no body is found, return the whole soup
-                return soup.body or soup
+                # If no body is found, return the whole document
+                body = tree.find('.//body')
+                return body if body is not None else tree
+        except etree.ParserError:
+            # Empty or whitespace-only documents have no content
+            return None
         except Exception as e:
             logger.error(f"Error extracting content: {e}")
-            return BeautifulSoup(html, 'lxml')
+            return None
 
     def extract_modules_from_headings(self, content):
         """
         Extract modules and submodules based on heading hierarchy.
 
         Args:
-            content (BeautifulSoup): BeautifulSoup object with content
+            content (lxml.html.HtmlElement): Element with content
 
         Returns:
             list: List of module dictionaries
@@ -118,66 +309,40 @@ class Parser:
         heading_stack = []  # Stack to track heading hierarchy
 
         # Find all headings
-        headings = content.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+        headings = list(content.iterdescendants('h1', 'h2', 'h3', 'h4', 'h5', 'h6'))
 
         # If no headings found, try to find divs with class names that might indicate headings
         if not headings:
-            potential_headings = content.find_all(['div', 'span'], class_=lambda c: c and any(x in str(c).lower() for x in ['title', 'heading', 'header', 'module', 'section']))
+            potential_headings = _find_all(content, ('div', 'span'), _HEADING_CLASS_RE)
             if potential_headings:
                 headings = potential_headings
 
-        # Sort headings by their position in the document
-        headings = sorted(headings, key=lambda x: x.sourceline or 0)
+        # Both searches return headings in document order, so they need no sorting
 
         for heading in headings:
-            heading_text = clean_text(heading.get_text())
+            heading_text = _element_text(heading)
             if not heading_text or len(heading_text) > 100:  # Skip empty or very long headings
                 continue
 
             # Get the heading level
-            if heading.name.startswith('h') and heading.name[1:].isdigit():
-                level = int(heading.name[1])
+            if heading.tag.startswith('h') and heading.tag[1:].isdigit():
+                level = int(heading.tag[1])
             else:
                 # For non-standard headings, determine level by font size, class, or other attributes
-                if heading.get('class') and any('title' in c.lower() for c in heading.get('class')):
+                if _class_matches(heading, _TITLE_CLASS_RE):
                     level = 1
-                elif heading.get('class') and any('subtitle' in c.lower() for c in heading.get('class')):
+                elif _class_matches(heading, _SUBTITLE_CLASS_RE):
                     level = 2
-                elif heading.get('class') and any('section' in c.lower() for c in heading.get('class')):
+                elif _class_matches(heading, _SECTION_CLASS_RE):
                     level = 3
                 else:
                     level = 3  # Default level for non-standard headings
 
-            # Extract description from the next sibling elements until the next heading
-            description = ""
-            next_element = heading.next_sibling
-
-            # Look for paragraph elements that might contain descriptions
-            while next_element:
-                if hasattr(next_element, 'name'):
-                    # Stop if we hit another heading
-                    if next_element.name and next_element.name.startswith('h'):
-                        break
-                    # Collect text from paragraphs and other content elements
-                    if next_element.name in ['p', 'div', 'span', 'section']:
-                        description += next_element.get_text() + " "
-                elif hasattr(next_element, 'string') and next_element.string:
-                    description += next_element.string + " "
-
-                next_element = next_element.next_sibling
-
-                # Limit description length to avoid excessive text
-                if len(description) > 500:
-                    description = description[:500] + "..."
-                    break
-
-            description = clean_text(description)
-
             # If it's a top-level heading (h1 or h2), create a new module
             if level <= 2:
                 current_module = {
                     "module": heading_text,
-                    "Description": description,
+                    "Description": _heading_description(heading),
                     "Submodules": {}
                 }
                 modules.append(current_module)
@@ -191,14 +356,16 @@ class Parser:
 
                 if not heading_stack:
                     # If no appropriate parent, add to the current module
-                    current_module["Submodules"][heading_text] = description
+                    current_module["Submodules"][heading_text] = _heading_description(heading)
                 else:
-                    # Add to the appropriate parent module
+                    # Add to the appropriate parent module; submodule headings have no entry of their own
+                    # in the output, so headings nested under them are not recorded
                     parent_level, parent_module = heading_stack[-1]
-                    parent_module["Submodules"][heading_text] = description
+                    if parent_module is not None:
+                        parent_module["Submodules"][heading_text] = _heading_description(heading)
 
                 # Add this heading to the stack
-                heading_stack.append((level, {"module": heading_text, "Description": description, "Submodules": {}}))
+                heading_stack.append((level, None))
 
         return modules
 
@@ -207,7 +374,7 @@ class Parser:
         Extract modules and submodules from lists.
 
         Args:
-            content (BeautifulSoup): BeautifulSoup object with content
+            content (lxml.html.HtmlElement): Element with content
 
         Returns:
             list: List of module dictionaries
@@ -215,19 +382,19 @@ class Parser:
         modules = []
 
         # Find all lists and navigation menus
-        lists = content.find_all(['ul', 'ol', 'nav', 'menu', 'div'], class_=lambda c: c and any(x in str(c).lower() for x in ['menu', 'nav', 'list', 'toc', 'index', 'modules']))
+        lists = _find_all(content, ('ul', 'ol', 'nav', 'menu', 'div'), _LIST_CLASS_RE)
 
         # If no lists found with special classes, fall back to regular lists
         if not lists:
-            lists = content.find_all(['ul', 'ol'])
+            lists = list(content.iterdescendants('ul', 'ol'))
 
         for list_element in lists:
             # Check if this list might be a module list
-            list_items = list_element.find_all('li', recursive=False)
+            list_items = list(list_element.iterchildren('li'))
 
             # If no li elements found, try to find div or a elements that might be list items
             if not list_items:
-                list_items = list_element.find_all(['div', 'a', 'span'], class_=lambda c: c and any(x in str(c).lower() for x in ['item', 'entry', 'module', 'link']))
+                list_items = _find_all(list_element, ('div', 'a', 'span'), _LIST_ITEM_CLASS_RE)
 
             # Skip very small lists
             if len(list_items) < 2:
@@ -236,37 +403,37 @@ class Parser:
             # Skip very large lists (likely not module lists)
             if len(list_items) > 50:
                 # Unless they have a class that suggests they're module lists
-                if not (list_element.get('class') and any(x in str(c).lower() for c in list_element.get('class') for x in ['module', 'api', 'doc', 'toc'])):
+                if not _class_matches(list_element, _MODULE_LIST_CLASS_RE):
                     continue
 
             # Check if the list has a heading that might indicate it's a module list
             list_heading = None
-            prev_element = list_element.previous_sibling
-            while prev_element and not list_heading:
-                if hasattr(prev_element, 'name') and prev_element.name and prev_element.name.startswith('h'):
-                    list_heading = clean_text(prev_element.get_text())
-                prev_element = prev_element.previous_sibling
+            for prev_element in list_element.itersiblings(preceding=True):
+                if isinstance(prev_element.tag, str) and prev_element.tag.startswith('h'):
+                    list_heading = _element_text(prev_element)
+                    if list_heading:
+                        break
 
             # Process each list item as a potential module
             for item in list_items:
-                item_text = clean_text(item.get_text())
+                item_text = _element_text(item)
                 if not item_text or len(item_text) > 200:  # Skip empty or very long items
                     continue
 
                 # Look for links or emphasized text as potential module names
                 module_name = None
-                module_link = item.find('a')
-                module_emphasis = item.find(['strong', 'b', 'em', 'i', 'span'], class_=lambda c: c and any(x in str(c).lower() for x in ['title', 'name', 'module']))
+                module_link = _find(item, ('a',))
+                module_emphasis = _find(item, ('strong', 'b', 'em', 'i', 'span'), _NAME_CLASS_RE)
 
-                if module_link:
-                    module_name = clean_text(module_link.get_text())
+                if module_link is not None:
+                    module_name = _element_text(module_link)
                     # Check if the link has a title attribute
                     if module_link.get('title'):
-                        module_title = clean_text(module_link['title'])
+                        module_title = clean_text(module_link.get('title'))
                         if module_title and module_title != module_name:
                             module_name = module_title
-                elif module_emphasis:
-                    module_name = clean_text(module_emphasis.get_text())
+                elif module_emphasis is not None:
+                    module_name = _element_text(module_emphasis)
                 else:
                     # Try to extract the first sentence or phrase as the module name
                     parts = item_text.split(':', 1)
@@ -278,9 +445,9 @@ class Parser:
                 # Extract description
                 description = ""
                 # Try to find a description in a paragraph or div following the link
-                desc_element = item.find(['p', 'div', 'span'], class_=lambda c: c and any(x in str(c).lower() for x in ['desc', 'summary', 'info']))
-                if desc_element:
-                    description = clean_text(desc_element.get_text())
+                desc_element = _find(item, ('p', 'div', 'span'), _DESCRIPTION_CLASS_RE)
+                if desc_element is not None:
+                    description = _element_text(desc_element)
                 # If no dedicated description element, use the item text minus the module name
                 elif module_name and module_name != item_text:
                     # Try to extract description after a colon or dash
@@ -295,29 +462,29 @@ class Parser:
                 submodules = {}
 
                 # First, look for nested lists
-                nested_lists = item.find_all(['ul', 'ol', 'div'], class_=lambda c: c and any(x in str(c).lower() for x in ['submenu', 'children', 'nested', 'sub']))
+                nested_lists = _find_all(item, ('ul', 'ol', 'div'), _NESTED_LIST_CLASS_RE)
 
                 for nested_list in nested_lists:
-                    nested_items = nested_list.find_all(['li', 'a', 'div', 'span'])
+                    nested_items = nested_list.iterdescendants('li', 'a', 'div', 'span')
                     for nested_item in nested_items:
-                        submodule_text = clean_text(nested_item.get_text())
+                        submodule_text = _element_text(nested_item)
                         if not submodule_text or len(submodule_text) > 100:  # Skip empty or very long items
                             continue
 
                         # Look for links or emphasized text as potential submodule names
                         submodule_name = None
-                        submodule_link = nested_item.find('a')
-                        submodule_emphasis = nested_item.find(['strong', 'b', 'em', 'i'])
+                        submodule_link = _find(nested_item, ('a',))
+                        submodule_emphasis = _find(nested_item, ('strong', 'b', 'em', 'i'))
 
-                        if submodule_link:
-                            submodule_name = clean_text(submodule_link.get_text())
+                        if submodule_link is not None:
+                            submodule_name = _element_text(submodule_link)
                             # Check if the link has a title attribute
                             if submodule_link.get('title'):
-                                submodule_title = clean_text(submodule_link['title'])
+                                submodule_title = clean_text(submodule_link.get('title'))
                                 if submodule_title and submodule_title != submodule_name:
                                     submodule_name = submodule_title
-                        elif submodule_emphasis:
-                            submodule_name = clean_text(submodule_emphasis.get_text())
+                        elif submodule_emphasis is not None:
+                            submodule_name = _element_text(submodule_emphasis)
                         else:
                             # Try to extract the first sentence or phrase as the submodule name
                             parts = submodule_text.split(':', 1)
@@ -329,9 +496,9 @@ class Parser:
                         # Extract description
                         submodule_description = ""
                         # Try to find a description in a paragraph or div
-                        subdesc_element = nested_item.find(['p', 'div', 'span'], class_=lambda c: c and any(x in str(c).lower() for x in ['desc', 'summary', 'info']))
-                        if subdesc_element:
-                            submodule_description = clean_text(subdesc_element.get_text())
+                        subdesc_element = _find(nested_item, ('p', 'div', 'span'), _DESCRIPTION_CLASS_RE)
+                        if subdesc_element is not None:
+                            submodule_description = _element_text(subdesc_element)
                         # If no dedicated description element, use the item text minus the submodule name
                         elif submodule_name and submodule_name != submodule_text:
                             # Try to extract description after a colon or dash
@@ -357,12 +524,14 @@ class Parser:
 
         return modules
 
-    def parse_html_batch(self, pages):
+    def parse_html_batch(self, pages, encodings=None):
         """
         Parse multiple HTML pages in parallel.
 
         Args:
             pages (dict): Dictionary of {url: html_content}
+            encodings (dict): Optional {url: charset} stated by the pages' Content-Type headers,
+                see Crawler.crawl(with_encodings=True)
 
         Returns:
             list: List of module dictionaries from all pages
@@ -378,64 +547,160 @@ class Parser:
         if self.quick_mode and total_pages > 20:
             # Select a subset of pages to process
             logger.info(f"Quick mode: Processing only 20 pages out of {total_pages}")
-            # Prioritize pages with 'api', 'doc', 'reference' in the URL
-            priority_pages = {url: html for url, html in pages.items()
-                             if any(keyword in url.lower() for keyword in ['api', 'doc', 'reference', 'module', 'class'])}
+            # Prioritize pages with 'api', 'doc', 'reference' in the URL, in one pass that stops
+            # as soon as 20 are found and keeps at most 20 of the others to fill up with
+            priority_pages = {}
+            remaining_pages = []
+            for url, html in pages.items():
+                if _URL_PRIORITY_RE.search(url):
+                    priority_pages[url] = html
+                    if len(priority_pages) == 20:
+                        break
+                elif len(remaining_pages) < 20:
+                    remaining_pages.append((url, html))
 
-            # If we have enough priority pages, use those; otherwise, add random pages
-            if len(priority_pages) >= 20:
-                pages_subset = dict(list(priority_pages.items())[:20])
-            else:
-                # Add random pages to reach 20
-                remaining_pages = {url: html for url, html in pages.items() if url not in priority_pages}
-                remaining_needed = 20 - len(priority_pages)
-                if remaining_needed > 0 and remaining_pages:
-                    random_subset = dict(list(remaining_pages.items())[:remaining_needed])
-                    pages_subset = {**priority_pages, **random_subset}
-                else:
-                    pages_subset = priority_pages
+            # If we don't have enough priority pages, add other pages to reach 20
+            pages_subset = priority_pages
+            pages_subset.update(remaining_pages[:20 - len(priority_pages)])
 
             # Replace the original pages with the subset
             pages = pages_subset
             total_pages = len(pages)
 
-        # Use ThreadPoolExecutor for parallel processing
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit parsing tasks for each page
-            future_to_url = {executor.submit(self.parse_single_html, html): url
-                            for url, html in pages.items()}
-
-            # Collect results as they complete
-            for future in concurrent.futures.as_completed(future_to_url):
-                url = future_to_url[future]
-                try:
-                    modules = future.result()
-                    all_modules.extend(modules)
-                    self.modules_found += len(modules)
-                    self.pages_processed += 1
-
-                    logger.info(f"Successfully parsed {url}, found {len(modules)} modules")
-                except Exception as e:
-                    logger.error(f"Error parsing {url}: {e}")
-                    self.pages_processed += 1
-
-        # Remove duplicates based on module name
-        unique_modules = []
-        module_names = set()
+        # Identical pages (e.g. "/" and "/index.html") and pages seen in earlier batches are parsed only once
+        encodings = encodings or {}
+        page_keys = {url: _content_key(html, encodings.get(url)) for url, html in pages.items()}
+        results = {}
+        to_parse = {}
+        with self._parse_cache_lock:
+            for url, html in pages.items():
+                key = page_keys[url]
+                if key in self._parse_cache:
+                    self._parse_cache.move_to_end(key)
+                    results[key] = self._parse_cache[key]
+                elif key not in to_parse:
+                    to_parse[key] = (url, html)
+
+        # Use a process pool, or a thread pool when processes are disabled, for parallel processing
+        keys = list(to_parse)
+        htmls = [to_parse[key][1] for key in keys]
+        page_encodings = [encodings.get(to_parse[key][0]) for key in keys]
+        chunksize = max(1, len(htmls) // (self.max_workers * 4))
+        if self.use_processes and (len(htmls) < MIN_PROCESS_BATCH or self.max_workers <= 1):
+            # Parse inline; the context yields no pool
+            executor = nullcontext()
+            parse = self.parse_single_html
+        elif self.use_processes:
+            # The shared pool stays open after the batch; workers rebuild their own Parser,
+            # so only the HTML bytes, their encodings and the options are pickled
+            executor = nullcontext(self._get_process_pool())
+            parse = functools.partial(_parse_worker, quick_mode=self.quick_mode,
+                                      aggressive=self.aggressive_submodule_detection, backend=self.backend)
+        else:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+            parse = self.parse_single_html
+
+        with executor as pool:
+            # Map over the distinct pages in order; parse_single_html logs and swallows its own errors
+            try:
+                if pool is None:
+                    parsed = map(parse, htmls, page_encodings)
+                else:
+                    parsed = pool.map(parse, htmls, page_encodings, chunksize=chunksize)
+                for key, modules in zip(keys, parsed):
+                    results[key] = modules
+                    self._cache_parse_result(key, modules)
+            except concurrent.futures.process.BrokenProcessPool as e:
+                # A worker died; drop the pool so the next batch starts a fresh one
+                logger.error(f"Error parsing batch: {e}")
+                self._discard_process_pool(pool)
+            except Exception as e:
+                logger.error(f"Error parsing batch: {e}")
+
+        for url, key in page_keys.items():
+            self.pages_processed += 1
+            if key not in results:
+                continue
+
+            modules = results[key]
+            all_modules.extend(modules)
+            self.modules_found += len(modules)
 
+            logger.info(f"Successfully parsed {url}, found {len(modules)} modules")
+
+        # Remove duplicates based on module name, keeping the first occurrence in page order
+        unique_modules = {}
         for module in all_modules:
-            if module["module"] not in module_names:
-                unique_modules.append(module)
-                module_names.add(module["module"])
+            unique_modules.setdefault(module["module"], module)
+
+        return list(unique_modules.values())
+
+    def _get_process_pool(self):
+        """
+        Get the parser's process pool, starting it on first use.
+        Workers are started with forkserver (or spawn where that is unavailable) rather than fork,
+        which is unsafe from multithreaded hosts such as the Streamlit server.
 
-        return unique_modules
+        Returns:
+            concurrent.futures.ProcessPoolExecutor: Process pool shared by every batch
+        """
+        with self._process_pool_lock:
+            if self._process_pool is None:
+                start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                self._process_pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(start_method)
+                )
+            return self._process_pool
+
+    def _discard_process_pool(self, pool):
+        """
+        Shut down a broken process pool and forget it, unless another batch already replaced it.
+
+        Args:
+            pool (concurrent.futures.ProcessPoolExecutor): Pool that failed
+        """
+        with self._process_pool_lock:
+            if self._process_pool is pool:
+                self._process_pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        """
+        Shut down the process pool, if one was started. The parser can still be used afterwards
+        and starts a new pool when it needs one.
+        """
+        with self._process_pool_lock:
+            pool, self._process_pool = self._process_pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _cache_parse_result(self, key, modules):
+        """
+        Store a page's parse result, evicting the least recently used entry when full.
+
+        Args:
+            key (bytes): Content hash of the page
+            modules (list): List of module dictionaries parsed from the page
+        """
+        with self._parse_cache_lock:
+            self._parse_cache[key] = modules
+            self._parse_cache.move_to_end(key)
+            if len(self._parse_cache) > PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
 
     def find_submodules_aggressively(self, content, modules):
         """
         Aggressively find submodules for existing modules.
 
         Args:
-            content (BeautifulSoup): BeautifulSoup object with content
+            content (lxml.html.HtmlElement): Element with content
             modules (list): List of module dictionaries
 
         Returns:
@@ -444,9 +709,39 @@ class Parser:
         if not modules or not self.aggressive_submodule_detection:
             return modules
 
+        # One walk over the content collects every candidate, grouped by kind in document order
+        candidates = {kind: [] for kind in _AGGRESSIVE_CANDIDATE_KINDS.values()}
+        for element in content.iterdescendants(*_AGGRESSIVE_CANDIDATE_KINDS):
+            candidates[_AGGRESSIVE_CANDIDATE_KINDS[element.tag]].append(element)
+        blocks = [block for block in candidates['block'] if block.get('class')]
+
+        # Candidate elements with their lowercased text and whether that mentions a submodule keyword,
+        # computed once for all modules instead of once per module
+        keyword_regex = self.submodule_keyword_regex
+        tables = _keyword_candidates(candidates['table'], keyword_regex)
+        dl_lists = _keyword_candidates(candidates['dl'], keyword_regex)
+        sections = _keyword_candidates([block for block in blocks if _class_matches(block, _SUBMODULE_SECTION_CLASS_RE)],
+                                       keyword_regex, self.submodule_regex)
+        lists = _keyword_candidates(candidates['list'], keyword_regex)
+        code_blocks = candidates['code']
+        help_sections = [block for block in blocks if _class_matches(block, _HELP_CLASS_RE)]
+        paragraphs = None  # Only needed for modules without submodules
+
+        # The (name, description) entries each candidate yields, extracted the first time a module needs them;
+        # only the module name filter and the module-specific default descriptions differ between modules
+        entries_cache = {}
+
+        def entries(extract, element):
+            key = (extract, element)
+            cached = entries_cache.get(key)
+            if cached is None:
+                cached = entries_cache[key] = extract(element)
+            return cached
+
         # For each module, try to find more submodules
         for module in modules:
             module_name = module["module"]
+            module_name_lower = module_name.lower()
 
             # Ensure Submodules exists
             if "Submodules" not in module:
@@ -456,157 +751,69 @@ class Parser:
             if len(module.get("Submodules", {})) > 15:
                 continue
 
-            # Common submodule keywords for documentation sites
-            submodule_keywords = [
-                'feature', 'tool', 'setting', 'option', 'preference', 'configuration',
-                'function', 'method', 'property', 'attribute', 'parameter',
-                'api', 'endpoint', 'service', 'utility', 'helper',
-                'component', 'element', 'widget', 'control',
-                'page', 'screen', 'view', 'section', 'panel',
-                'create', 'edit', 'delete', 'manage', 'configure',
-                'upload', 'download', 'share', 'publish', 'post',
-                'privacy', 'security', 'permission', 'access', 'role',
-                'notification', 'alert', 'message', 'comment', 'feedback',
-                'profile', 'account', 'user', 'group', 'team',
-                'search', 'filter', 'sort', 'browse', 'navigate',
-                'import', 'export', 'backup', 'restore', 'sync',
-                'report', 'analytics', 'statistics', 'metric', 'dashboard',
-                'schedule', 'calendar', 'event', 'reminder', 'notification',
-                'payment', 'subscription', 'billing', 'invoice', 'transaction',
-                'integration', 'connection', 'plugin', 'extension', 'add-on'
-            ]
-
-            # 1. Look for tables that might contain submodules
-            tables = content.find_all('table')
-            for table in tables:
-                # Check if the table is related to this module
-                table_text = table.get_text().lower()
-                if module_name.lower() in table_text or any(keyword in table_text for keyword in submodule_keywords):
-                    # Extract rows as potential submodules
-                    rows = table.find_all('tr')
-                    for row in rows[1:]:  # Skip header row
-                        cells = row.find_all(['td', 'th'])
-                        if len(cells) >= 2:
-                            submodule_name = clean_text(cells[0].get_text())
-                            submodule_desc = clean_text(cells[1].get_text())
-                            if submodule_name and len(submodule_name) < 100 and submodule_name != module_name:
-                                module["Submodules"][submodule_name] = submodule_desc
+            submodules = module["Submodules"]
+
+            # 1. Look for tables that might contain submodules, related to this module or any submodule keyword
+            for table, table_text, has_keyword in tables:
+                if has_keyword or module_name_lower in table_text:
+                    for submodule_name, submodule_desc in entries(_table_entries, table):
+                        if submodule_name != module_name:
+                            submodules[submodule_name] = submodule_desc
 
             # 2. Look for definition lists
-            dl_lists = content.find_all('dl')
-            for dl in dl_lists:
-                # Check if the list is related to this module
-                dl_text = dl.get_text().lower()
-                if module_name.lower() in dl_text or any(keyword in dl_text for keyword in submodule_keywords):
-                    # Extract dt/dd pairs as potential submodules
-                    dts = dl.find_all('dt')
-                    for dt in dts:
-                        submodule_name = clean_text(dt.get_text())
-                        dd = dt.find_next('dd')
-                        submodule_desc = clean_text(dd.get_text()) if dd else ""
-                        if submodule_name and len(submodule_name) < 100 and submodule_name != module_name:
-                            module["Submodules"][submodule_name] = submodule_desc
+            for dl, dl_text, has_keyword in dl_lists:
+                if has_keyword or module_name_lower in dl_text:
+                    for submodule_name, submodule_desc in entries(_dl_entries, dl):
+                        if submodule_name != module_name:
+                            submodules[submodule_name] = submodule_desc
 
             # 3. Look for sections with submodule-like names
-            sections = content.find_all(['div', 'section'], class_=lambda c: c and any(x in str(c).lower() for x in ['api', 'method', 'function', 'property', 'feature', 'tool', 'setting']))
-            for section in sections:
-                # Check if the section is related to this module
-                section_text = section.get_text().lower()
-                if module_name.lower() in section_text or self.submodule_regex.search(section_text) or any(keyword in section_text for keyword in submodule_keywords):
-                    # Find headings within the section
-                    headings = section.find_all(['h3', 'h4', 'h5', 'h6'])
-                    for heading in headings:
-                        submodule_name = clean_text(heading.get_text())
-                        # Get description from next sibling paragraph
-                        next_p = heading.find_next('p')
-                        submodule_desc = clean_text(next_p.get_text()) if next_p else ""
-                        if submodule_name and len(submodule_name) < 100 and submodule_name != module_name:
-                            module["Submodules"][submodule_name] = submodule_desc
+            for section, section_text, has_keyword in sections:
+                if has_keyword or module_name_lower in section_text:
+                    for submodule_name, submodule_desc in entries(_section_entries, section):
+                        if submodule_name != module_name:
+                            submodules[submodule_name] = submodule_desc
 
             # 4. Look for lists that might contain submodules
-            lists = content.find_all(['ul', 'ol'])
-            for list_element in lists:
-                list_text = list_element.get_text().lower()
-                if module_name.lower() in list_text or any(keyword in list_text for keyword in submodule_keywords):
-                    list_items = list_element.find_all('li')
-                    for item in list_items:
-                        item_text = clean_text(item.get_text())
-
-                        # Try to extract submodule name and description
-                        if ':' in item_text:
-                            parts = item_text.split(':', 1)
-                            submodule_name = clean_text(parts[0])
-                            submodule_desc = clean_text(parts[1])
-                        elif ' - ' in item_text:
-                            parts = item_text.split(' - ', 1)
-                            submodule_name = clean_text(parts[0])
-                            submodule_desc = clean_text(parts[1])
-                        elif item.find('strong') or item.find('b'):
-                            strong = item.find('strong') or item.find('b')
-                            submodule_name = clean_text(strong.get_text())
-                            submodule_desc = clean_text(item_text.replace(submodule_name, ''))
-                        elif item.find('a'):
-                            link = item.find('a')
-                            submodule_name = clean_text(link.get_text())
-                            submodule_desc = clean_text(item_text.replace(submodule_name, ''))
-                        else:
-                            # If no clear structure, use the whole text as name
-                            submodule_name = item_text
-                            submodule_desc = "Feature or setting in " + module_name
-
-                        if submodule_name and len(submodule_name) < 100 and submodule_name != module_name:
-                            module["Submodules"][submodule_name] = submodule_desc
+            for list_element, list_text, has_keyword in lists:
+                if has_keyword or module_name_lower in list_text:
+                    for submodule_name, submodule_desc in entries(_list_entries, list_element):
+                        if submodule_name != module_name:
+                            # If no clear structure, the whole text is the name
+                            submodules[submodule_name] = submodule_desc if submodule_desc is not None else "Feature or setting in " + module_name
 
             # 5. Look for code blocks that might contain submodules
-            code_blocks = content.find_all(['pre', 'code'])
             for code_block in code_blocks:
-                code_text = code_block.get_text()
-                # Look for patterns like "function X", "method Y", "property Z"
-                for pattern in ['function', 'method', 'class', 'property', 'attribute', 'parameter', 'option', 'setting', 'feature']:
-                    matches = re.finditer(rf'{pattern}\s+([a-zA-Z0-9_]+)', code_text, re.IGNORECASE)
-                    for match in matches:
-                        submodule_name = match.group(1)
-                        if submodule_name and submodule_name != module_name:
-                            module["Submodules"][submodule_name] = f"{pattern.capitalize()} in {module_name}"
+                for submodule_name, label in entries(_code_entries, code_block):
+                    if submodule_name != module_name:
+                        submodules[submodule_name] = f"{label} in {module_name}"
 
             # 6. Look for specific documentation patterns
-            help_sections = content.find_all(['div', 'section'], class_=lambda c: c and any(x in str(c).lower() for x in ['help', 'faq', 'guide', 'tutorial', 'howto', 'how-to']))
             for section in help_sections:
-                # Find all links in the help section
-                links = section.find_all('a')
-                for link in links:
-                    link_text = clean_text(link.get_text())
-                    if link_text and len(link_text) < 100 and link_text != module_name:
-                        # Try to get description from title attribute or parent paragraph
-                        if link.get('title'):
-                            submodule_desc = clean_text(link['title'])
-                        elif link.parent and link.parent.name == 'p':
-                            submodule_desc = clean_text(link.parent.get_text().replace(link_text, ''))
-                        else:
-                            submodule_desc = f"Help topic in {module_name}"
-
-                        module["Submodules"][link_text] = submodule_desc
+                for link_text, submodule_desc in entries(_help_entries, section):
+                    if link_text != module_name:
+                        submodules[link_text] = submodule_desc if submodule_desc is not None else f"Help topic in {module_name}"
 
             # 7. If still no submodules, try to extract from paragraphs
-            if not module["Submodules"]:
-                paragraphs = content.find_all('p')
-                for p in paragraphs:
-                    p_text = p.get_text().lower()
-                    if module_name.lower() in p_text:
+            if not submodules:
+                if paragraphs is None:
+                    paragraphs = [(p, p.text_content().lower()) for p in content.iterdescendants('p')]
+                for p, p_text in paragraphs:
+                    if module_name_lower in p_text:
                         # Look for strong/bold text or links as potential submodules
-                        for element in p.find_all(['strong', 'b', 'a', 'em']):
-                            submodule_name = clean_text(element.get_text())
-                            if submodule_name and len(submodule_name) < 100 and submodule_name != module_name:
-                                module["Submodules"][submodule_name] = f"Feature mentioned in {module_name} documentation"
+                        for submodule_name in entries(_paragraph_entries, p):
+                            if submodule_name != module_name:
+                                submodules[submodule_name] = f"Feature mentioned in {module_name} documentation"
 
         return modules
 
-    def parse_single_html(self, html):
+    def parse_single_html(self, html, encoding=None):
         """
         Parse a single HTML content to extract modules and submodules.
 
         Args:
-            html (str): HTML content
+            html (bytes or str): HTML content
+            encoding (str): Charset stated by the page's Content-Type header, if any
 
         Returns:
             list: List of module dictionaries
@@ -615,11 +822,29 @@ class Parser:
             # Limit the HTML content size to improve performance
             if len(html) > 300000:  # 300KB
                 logger.info(f"Truncating large HTML content from {len(html)} bytes")
-                # Keep the first part of the HTML which usually contains the most important content
-                html = html[:300000]
+                # Keep the first part of the HTML which usually contains the most important content,
+                # cutting before a tag the limit would split rather than leaving half of it to the parser
+                lt, gt = (b'<', b'>') if isinstance(html, bytes) else ('<', '>')
+                tag_start = html.rfind(lt, 0, 300000)
+                html = html[:tag_start if tag_start > html.rfind(gt, 0, 300000) else 300000]
+
+            # Stop at the start tag of the first heading or list item past MAX_PAGE_ELEMENTS, so pages
+            # with huge tables of contents don't build trees the extractors won't need;
+            # shorter pages cannot hold that many tags
+            if len(html) > MAX_PAGE_ELEMENTS * 4:
+                tag_re = _STRUCTURE_TAG_RE if isinstance(html, bytes) else _STRUCTURE_TAG_STR_RE
+                cut = next(islice(tag_re.finditer(html), MAX_PAGE_ELEMENTS, None), None)
+                if cut is not None:
+                    logger.info(f"Stopping after {MAX_PAGE_ELEMENTS} heading and list elements, at offset {cut.start()}")
+                    html = html[:cut.start()]
+
+            if self.backend == "lexbor":
+                return self._parse_lexbor(html, encoding)
 
             # Extract the main content
-            content = self.extract_content(html)
+            content = self.extract_content(html, encoding)
+            if content is None:
+                return []
 
             # Extract modules from headings
             modules_from_headings = self.extract_modules_from_headings(content)
@@ -640,15 +865,671 @@ class Parser:
             logger.error(f"Error parsing HTML: {e}")
             return []
 
+    def _parse_lexbor(self, html, encoding=None):
+        """
+        Parse HTML with selectolax's Lexbor engine, mirroring the heading and list extraction.
+
+        Args:
+            html (bytes or str): HTML content
+            encoding (str): Charset stated by the page's Content-Type header, if any
+
+        Returns:
+            list: List of module dictionaries
+        """
+        # Lexbor reads bytes as UTF-8, so decode pages whose header stated another charset
+        encoding = _stated_encoding(html, encoding)
+        if encoding is not None:
+            try:
+                html = html.decode(encoding, 'replace')
+            except LookupError:
+                pass
+        tree = LexborHTMLParser(html)
+
+        # Remove common non-content elements
+        for element in tree.css(self.non_content_selectors):
+            element.decompose()
+
+        content = tree.css_first(self.main_content_selectors) or tree.body or tree.root
+        if content is None:
+            return []
+
+        return self._extract_headings_lexbor(content) + self._extract_lists_lexbor(content)
+
+    def _extract_headings_lexbor(self, content):
+        """
+        Extract modules and submodules based on heading hierarchy from a Lexbor node.
+
+        Args:
+            content (LexborNode): Lexbor node with content
+
+        Returns:
+            list: List of module dictionaries
+        """
+        modules = []
+        current_module = None
+        heading_stack = []
+
+        headings = _lexbor_find_all(content, 'h1, h2, h3, h4, h5, h6')
+        if not headings:
+            headings = [node for node in _lexbor_find_all(content, 'div[class], span[class]')
+                        if _lexbor_class_matches(node, _HEADING_CLASS_RE)]
+
+        for heading in headings:
+            heading_text = clean_text(heading.text())
+            if not heading_text or len(heading_text) > 100:
+                continue
+
+            if heading.tag[1:].isdigit():
+                level = int(heading.tag[1])
+            elif _lexbor_class_matches(heading, _TITLE_CLASS_RE):
+                level = 1
+            elif _lexbor_class_matches(heading, _SUBTITLE_CLASS_RE):
+                level = 2
+            else:
+                level = 3
+
+            if level <= 2:
+                current_module = {
+                    "module": heading_text,
+                    "Description": _lexbor_heading_description(heading),
+                    "Submodules": {}
+                }
+                modules.append(current_module)
+                heading_stack = [(level, current_module)]
+            elif current_module:
+                while heading_stack and heading_stack[-1][0] >= level:
+                    heading_stack.pop()
+
+                if not heading_stack:
+                    current_module["Submodules"][heading_text] = _lexbor_heading_description(heading)
+                elif heading_stack[-1][1] is not None:
+                    heading_stack[-1][1]["Submodules"][heading_text] = _lexbor_heading_description(heading)
+
+                heading_stack.append((level, None))
+
+        return modules
+
+    def _extract_lists_lexbor(self, content):
+        """
+        Extract modules and submodules from lists in a Lexbor node.
+
+        Args:
+            content (LexborNode): Lexbor node with content
+
+        Returns:
+            list: List of module dictionaries
+        """
+        modules = []
+
+        lists = [node for node in _lexbor_find_all(content, 'ul[class], ol[class], nav[class], menu[class], div[class]')
+                 if _lexbor_class_matches(node, _LIST_CLASS_RE)]
+        if not lists:
+            lists = _lexbor_find_all(content, 'ul, ol')
+
+        for list_element in lists:
+            list_items = [child for child in list_element.iter() if child.tag == 'li']
+            if not list_items:
+                list_items = [node for node in _lexbor_find_all(list_element, 'div[class], a[class], span[class]')
+                              if _lexbor_class_matches(node, _LIST_ITEM_CLASS_RE)]
+
+            if len(list_items) < 2:
+                continue
+            if len(list_items) > 50 and not _lexbor_class_matches(list_element, _MODULE_LIST_CLASS_RE):
+                continue
+
+            for item in list_items:
+                item_text = clean_text(item.text())
+                if not item_text or len(item_text) > 200:
+                    continue
+
+                module_name, description = _lexbor_name_and_description(
+                    item, item_text, emphasis_class_re=_NAME_CLASS_RE)
+
+                submodules = {}
+                nested_lists = [node for node in _lexbor_find_all(item, 'ul[class], ol[class], div[class]')
+                                if _lexbor_class_matches(node, _NESTED_LIST_CLASS_RE)]
+                for nested_list in nested_lists:
+                    for nested_item in _lexbor_find_all(nested_list, 'li, a, div, span'):
+                        submodule_text = clean_text(nested_item.text())
+                        if not submodule_text or len(submodule_text) > 100:
+                            continue
+
+                        submodule_name, submodule_description = _lexbor_name_and_description(
+                            nested_item, submodule_text)
+
+                        if submodule_name and submodule_name not in submodules:
+                            submodules[submodule_name] = submodule_description
+
+                if module_name and (description or submodules):
+                    modules.append({
+                        "module": module_name,
+                        "Description": description,
+                        "Submodules": submodules
+                    })
+
+        return modules
+
     def parse_html(self, html):
         """
         Parse HTML content to extract modules and submodules.
         Backward compatibility method.
 
         Args:
-            html (str): HTML content
+            html (bytes or str): HTML content
 
         Returns:
             list: List of module dictionaries
         """
         return self.parse_single_html(html)
+
+
+# Parser instances built inside process pool workers, keyed by their options
+_worker_parsers = {}
+
+
+def _parse_worker(html, encoding, quick_mode, aggressive, backend):
+    """
+    Parse a single page in a process pool worker.
+
+    Args:
+        html (bytes or str): HTML content
+        encoding (str): Charset stated by the page's Content-Type header, if any
+        quick_mode (bool): Quick mode setting of the calling Parser
+        aggressive (bool): Aggressive submodule detection setting of the calling Parser
+        backend (str): Backend of the calling Parser
+
+    Returns:
+        list: List of module dictionaries
+    """
+    options = (quick_mode, aggressive, backend)
+    parser = _worker_parsers.get(options)
+    if parser is None:
+        parser = Parser(max_workers=1, quick_mode=quick_mode,
+                        aggressive_submodule_detection=aggressive, backend=backend)
+        _worker_parsers[options] = parser
+    return parser.parse_single_html(html, encoding)
+
+
+def _content_key(html, encoding=None):
+    """
+    Hash page content, and the charset it is read with, so identical pages share one parse result.
+    """
+    if isinstance(html, str):
+        html = html.encode('utf-8', 'surrogatepass')
+    digest = hashlib.blake2b(html, digest_size=16)
+    if encoding:
+        digest.update(b'\0' + encoding.encode('ascii', 'replace'))
+    return digest.digest()
+
+
+def _utf8_html_parser():
+    """
+    Get this thread's lxml HTML parser for UTF-8 input.
+
+    Returns:
+        lxml.html.HTMLParser: Parser reused for every UTF-8 page parsed on this thread
+    """
+    parser = getattr(_thread_local, 'utf8_html_parser', None)
+    if parser is None:
+        parser = _thread_local.utf8_html_parser = lxml.html.HTMLParser(encoding='utf-8')
+    return parser
+
+
+def _charset_html_parser(encoding):
+    """
+    Get this thread's lxml HTML parser for a charset stated by a Content-Type header.
+
+    Args:
+        encoding (str): Charset name
+
+    Returns:
+        lxml.html.HTMLParser or None: Parser reused for every page in that charset on this thread,
+            None if libxml2 does not know the charset
+    """
+    parsers = getattr(_thread_local, 'charset_html_parsers', None)
+    if parsers is None:
+        parsers = _thread_local.charset_html_parsers = {}
+    if encoding not in parsers:
+        try:
+            parsers[encoding] = lxml.html.HTMLParser(encoding=encoding)
+        except LookupError:
+            logger.warning(f"Ignoring unknown charset {encoding}")
+            parsers[encoding] = None
+    return parsers[encoding]
+
+
+def _declares_charset(html):
+    """
+    Check whether a byte page declares its own charset with a BOM or near its start.
+    """
+    return html.startswith(_BOMS) or _CHARSET_DECLARATION_RE.search(html, 0, max(2048, len(html) // 20)) is not None
+
+
+def _stated_encoding(html, encoding):
+    """
+    Get the Content-Type charset to read a page with; the page's own BOM or meta charset takes precedence.
+
+    Args:
+        html (bytes or str): HTML content
+        encoding (str): Charset stated by the page's Content-Type header, if any
+
+    Returns:
+        str or None: The charset, None for str pages, pages declaring their own charset or no stated charset
+    """
+    if not encoding or not isinstance(html, bytes) or _declares_charset(html):
+        return None
+    return encoding
+
+
+def _html_document(html, encoding=None):
+    """
+    Parse HTML into an lxml document. Byte pages without a BOM or declared charset are read with
+    the charset their Content-Type header stated, or else as UTF-8 when they decode as such,
+    rather than with libxml2's Latin-1 default.
+
+    Args:
+        html (bytes or str): HTML content
+        encoding (str): Charset stated by the page's Content-Type header, if any
+
+    Returns:
+        lxml.html.HtmlElement: Root element of the document
+
+    Raises:
+        lxml.etree.ParserError: If the document is empty
+    """
+    if isinstance(html, str):
+        # lxml rejects str input with an XML encoding declaration, so always hand it UTF-8 bytes
+        return lxml.html.document_fromstring(html.encode('utf-8', 'surrogatepass'), parser=_utf8_html_parser())
+
+    if not _declares_charset(html):
+        parser = _charset_html_parser(encoding) if encoding else None
+        if parser is not None:
+            return lxml.html.document_fromstring(html, parser=parser)
+
+        # ASCII is valid UTF-8; checking for it scans the bytes without decoding a copy of the page
+        if html.isascii():
+            is_utf8 = True
+        else:
+            try:
+                html.decode('utf-8')
+                is_utf8 = True
+            except UnicodeDecodeError as e:
+                # Pages cut off by the crawler's size limit may end inside a multi-byte character
+                is_utf8 = e.start >= len(html) - 3
+        if is_utf8:
+            return lxml.html.document_fromstring(html, parser=_utf8_html_parser())
+
+    return lxml.html.document_fromstring(html)
+
+
+def _selector_xpath(selectors):
+    """
+    Compile a comma-separated list of simple CSS selectors (tag, .class or #id) into an XPath
+    that finds matching descendants in document order.
+    """
+    tests = []
+    for selector in selectors.split(','):
+        selector = selector.strip()
+        if selector.startswith('.'):
+            tests.append(f"contains(concat(' ', normalize-space(@class), ' '), ' {selector[1:]} ')")
+        elif selector.startswith('#'):
+            tests.append(f"@id='{selector[1:]}'")
+        else:
+            tests.append(f"self::{selector}")
+    return etree.XPath(f"descendant::*[{' or '.join(tests)}]")
+
+
+def _heading_description(heading):
+    """
+    Collect the text of the paragraphs and other content elements following a heading, up to the
+    next heading, as its description. Descriptions are cut to about 500 characters.
+
+    Args:
+        heading (lxml.html.HtmlElement): Heading element
+
+    Returns:
+        str: Cleaned description, empty if there is none
+    """
+    # Collect the pieces with a running length instead of re-concatenating the string
+    parts = []
+    length = 0
+    truncated = False
+
+    # Look for paragraph elements that might contain descriptions; text between elements is skipped
+    for next_element in heading.itersiblings():
+        tag = next_element.tag
+        # Comments and processing instructions have no string tag
+        if isinstance(tag, str):
+            # Stop if we hit another heading
+            if tag.startswith('h'):
+                break
+            # Collect text from paragraphs and other content elements
+            if tag in ('p', 'div', 'span', 'section'):
+                text = next_element.text_content()
+                parts.append(text)
+                parts.append(" ")
+                length += len(text) + 1
+
+        # Limit description length to avoid excessive text
+        if length > 500:
+            truncated = True
+            break
+
+    description = "".join(parts)
+    if truncated:
+        description = description[:500] + "..."
+    return clean_text(description)
+
+
+def _element_text(element):
+    """
+    Get an element's text with whitespace collapsed, as clean_text(element.text_content()) would.
+    Empty leaf elements return without building or scanning any text.
+    """
+    if not element.text and not len(element):
+        return ""
+    # str.split() splits on exactly the characters \s matches and drops the ends, without the regex engine
+    return ' '.join(element.text_content().split())
+
+
+def _class_matches(element, class_re):
+    """
+    Check whether an element's class attribute matches a class keyword regex.
+    """
+    classes = element.get('class')
+    return bool(classes) and class_re.search(classes) is not None
+
+
+def _find_all(element, tags, class_re=None):
+    """
+    Find descendants with one of the tags, and a class matching class_re if given.
+    """
+    if class_re is None:
+        return list(element.iterdescendants(*tags))
+    # The tag filter runs inside lxml; only the class test is left to Python, inlined for the hot loop
+    search = class_re.search
+    return [node for node in element.iterdescendants(*tags) if search(node.get('class') or '')]
+
+
+def _find(element, tags, class_re=None):
+    """
+    Find the first descendant with one of the tags, and a class matching class_re if given, or None.
+    """
+    for node in element.iterdescendants(*tags):
+        if class_re is None or _class_matches(node, class_re):
+            return node
+    return None
+
+
+def _keyword_candidates(elements, *regexes):
+    """
+    Pair elements with their lowercased text and whether any of the regexes finds a match in it.
+
+    Args:
+        elements (iterable): Elements to pair
+        *regexes (re.Pattern): Regexes searched in the lowercased text
+
+    Returns:
+        list: List of (element, lowercased_text, matched) tuples
+    """
+    candidates = []
+    for element in elements:
+        text = element.text_content().lower()
+        candidates.append((element, text, any(regex.search(text) for regex in regexes)))
+    return candidates
+
+
+def _table_entries(table):
+    """
+    Extract (name, description) entries from the rows of a table, skipping the header row.
+    """
+    entries = []
+    rows = list(table.iterdescendants('tr'))
+    for row in rows[1:]:
+        cells = list(row.iterdescendants('td', 'th'))
+        if len(cells) >= 2:
+            submodule_name = _element_text(cells[0])
+            submodule_desc = _element_text(cells[1])
+            if submodule_name and len(submodule_name) < 100:
+                entries.append((submodule_name, submodule_desc))
+    return entries
+
+
+def _pair_with_next(container, tags, target):
+    """
+    Pair each descendant with one of the tags with the first target element after it in document order.
+    One backward pass over the container replaces a forward search per element; elements with no target
+    left inside the container share the first one following it.
+
+    Args:
+        container (lxml.html.HtmlElement): Element to search
+        tags (tuple): Tags of the elements to pair
+        target (str): Tag of the elements to pair them with, a key of _FOLLOWING_XPATHS
+
+    Returns:
+        list: List of (element, target_element or None) tuples in document order
+    """
+    pairs = []
+    next_target = None
+    following = None
+    for node in reversed(list(container.iterdescendants(target, *tags))):
+        if node.tag == target:
+            next_target = node
+        elif next_target is not None:
+            pairs.append((node, next_target))
+        else:
+            if following is None:
+                following = _FOLLOWING_XPATHS[target](container)
+            pairs.append((node, following[0] if following else None))
+    pairs.reverse()
+    return pairs
+
+
+def _dl_entries(dl):
+    """
+    Extract (name, description) entries from the dt/dd pairs of a definition list.
+    """
+    entries = []
+    for dt, dd in _pair_with_next(dl, ('dt',), 'dd'):
+        submodule_name = _element_text(dt)
+        if submodule_name and len(submodule_name) < 100:
+            entries.append((submodule_name, _element_text(dd) if dd is not None else ""))
+    return entries
+
+
+def _section_entries(section):
+    """
+    Extract (name, description) entries from the headings of a section and the paragraphs after them.
+    """
+    entries = []
+    for heading, next_p in _pair_with_next(section, ('h3', 'h4', 'h5', 'h6'), 'p'):
+        submodule_name = _element_text(heading)
+        if submodule_name and len(submodule_name) < 100:
+            entries.append((submodule_name, _element_text(next_p) if next_p is not None else ""))
+    return entries
+
+
+def _list_entries(list_element):
+    """
+    Extract (name, description) entries from the items of a list.
+    Items without a clear structure get a None description, filled in per module.
+    """
+    entries = []
+    for item in list_element.iterdescendants('li'):
+        item_text = _element_text(item)
+
+        # Try to extract submodule name and description
+        if ':' in item_text:
+            parts = item_text.split(':', 1)
+            submodule_name = clean_text(parts[0])
+            submodule_desc = clean_text(parts[1])
+        elif ' - ' in item_text:
+            parts = item_text.split(' - ', 1)
+            submodule_name = clean_text(parts[0])
+            submodule_desc = clean_text(parts[1])
+        elif _find(item, ('strong',)) is not None or _find(item, ('b',)) is not None:
+            strong = _find(item, ('strong',))
+            if strong is None:
+                strong = _find(item, ('b',))
+            submodule_name = _element_text(strong)
+            submodule_desc = clean_text(item_text.replace(submodule_name, ''))
+        elif _find(item, ('a',)) is not None:
+            link = _find(item, ('a',))
+            submodule_name = _element_text(link)
+            submodule_desc = clean_text(item_text.replace(submodule_name, ''))
+        else:
+            submodule_name = item_text
+            submodule_desc = None
+
+        if submodule_name and len(submodule_name) < 100:
+            entries.append((submodule_name, submodule_desc))
+    return entries
+
+
+def _code_entries(code_block):
+    """
+    Extract (name, label) entries for declarations like "function X" or "method Y" in a code block.
+    """
+    code_text = code_block.text_content()
+    return [(match.group(1), label)
+            for declaration_regex, label in _CODE_DECLARATION_RES
+            for match in declaration_regex.finditer(code_text)]
+
+
+def _help_entries(section):
+    """
+    Extract (name, description) entries from the links of a help section.
+    Links without a title or enclosing paragraph get a None description, filled in per module.
+    """
+    entries = []
+    for link in section.iterdescendants('a'):
+        link_text = _element_text(link)
+        if link_text and len(link_text) < 100:
+            # Try to get description from title attribute or parent paragraph
+            parent = link.getparent()
+            if link.get('title'):
+                submodule_desc = clean_text(link.get('title'))
+            elif parent is not None and parent.tag == 'p':
+                submodule_desc = clean_text(parent.text_content().replace(link_text, ''))
+            else:
+                submodule_desc = None
+            entries.append((link_text, submodule_desc))
+    return entries
+
+
+def _paragraph_entries(p):
+    """
+    Extract the strong, bold, emphasized or linked text of a paragraph as submodule names.
+    """
+    names = []
+    for element in p.iterdescendants('strong', 'b', 'a', 'em'):
+        submodule_name = _element_text(element)
+        if submodule_name and len(submodule_name) < 100:
+            names.append(submodule_name)
+    return names
+
+
+def _is_lexbor_element(tag):
+    """
+    Check whether a Lexbor node tag names an element rather than text or a comment.
+    """
+    return not tag.startswith(('-', '_', '!'))
+
+
+def _lexbor_heading_description(heading):
+    """
+    Collect the text of the sibling elements following a Lexbor heading, up to the next heading.
+    """
+    description = ""
+    next_element = heading.next
+    while next_element is not None:
+        tag = next_element.tag
+        if _is_lexbor_element(tag):
+            if tag.startswith('h'):
+                break
+            if tag in ('p', 'div', 'span', 'section'):
+                description += next_element.text() + " "
+        next_element = next_element.next
+
+        if len(description) > 500:
+            description = description[:500] + "..."
+            break
+
+    return clean_text(description)
+
+
+def _lexbor_find_all(node, selector):
+    """
+    Find descendants of a Lexbor node; unlike lxml's iterdescendants, css() also matches the node itself.
+    """
+    return [match for match in node.css(selector) if match != node]
+
+
+def _lexbor_find(node, selector):
+    """
+    Find the first descendant of a Lexbor node matching the selector, or None.
+    """
+    matches = _lexbor_find_all(node, selector)
+    return matches[0] if matches else None
+
+
+def _lexbor_class_matches(node, class_re):
+    """
+    Check whether a Lexbor node's class attribute matches a class keyword regex.
+    """
+    classes = node.attributes.get('class')
+    return bool(classes) and class_re.search(classes) is not None
+
+
+def _lexbor_name_and_description(item, item_text, emphasis_class_re=None):
+    """
+    Split a Lexbor list item into a (name, description) pair.
+
+    Args:
+        item (LexborNode): List item node
+        item_text (str): Cleaned text of the item
+        emphasis_class_re (re.Pattern): Class keyword regex an emphasis element must match, or None for any
+
+    Returns:
+        tuple: (name, description)
+    """
+    name = None
+    link = _lexbor_find(item, 'a')
+    emphasis = None
+    for node in _lexbor_find_all(item, 'strong, b, em, i' if emphasis_class_re is None else 'strong, b, em, i, span'):
+        if emphasis_class_re is None or _lexbor_class_matches(node, emphasis_class_re):
+            emphasis = node
+            break
+
+    if link is not None:
+        name = clean_text(link.text())
+        title = clean_text(link.attributes.get('title') or '')
+        if title and title != name:
+            name = title
+    elif emphasis is not None:
+        name = clean_text(emphasis.text())
+    else:
+        parts = item_text.split(':', 1)
+        if len(parts) > 1 and len(parts[0]) < 50:
+            name = clean_text(parts[0])
+        else:
+            name = item_text
+
+    description = ""
+    desc_element = None
+    for node in _lexbor_find_all(item, 'p[class], div[class], span[class]'):
+        if _lexbor_class_matches(node, _DESCRIPTION_CLASS_RE):
+            desc_element = node
+            break
+
+    if desc_element is not None:
+        description = clean_text(desc_element.text())
+    elif name and name != item_text:
+        if ':' in item_text:
+            description = clean_text(item_text.split(':', 1)[1])
+        elif ' - ' in item_text:
+            description = clean_text(item_text.split(' - ', 1)[1])
+        else:
+            description = clean_text(item_text.replace(name, '', 1))
+
+    return name, description
@@ -0,0 +1,130 @@
+"""
+End-to-end extraction pipeline. crawl_and_parse is shared by the Streamlit app and the command line tool,
+run_pipeline adds the app's formatting.
+"""
+import asyncio
+import logging
+import time
+from .crawler import Crawler, CrawlError
+from .parser import Parser
+from .formatter import format_modules, dumps_json_bytes
+from .utils import cached_urlparse
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def _report(progress, percent, message):
+    """
+    Forward a progress update to the optional callback.
+    """
+    if progress is not None:
+        progress(percent, message)
+
+
+def crawl_and_parse(url, max_pages=20, timeout=3, aggressive=True, progress=None, crawler=None, parser=None):
+    """
+    Crawl a documentation website and parse modules from its pages.
+
+    Args:
+        url (str): Normalized URL of the documentation website
+        max_pages (int): Maximum number of pages to crawl
+        timeout (int): Timeout for HTTP requests in seconds
+        aggressive (bool): Whether to use aggressive submodule detection
+        progress (callable): Optional callback taking (percent, message)
+        crawler (Crawler): Optional crawler to reuse, built from the options otherwise
+        parser (Parser): Optional parser to reuse, built from the options otherwise
+
+    Returns:
+        tuple: (pages_count, all_modules)
+
+    Raises:
+        CrawlError: If no pages could be crawled
+    """
+    domain = cached_urlparse(url).netloc
+
+    # Step 1: Crawl the website
+    _report(progress, 10, f"Crawling {domain}...")
+    owns_crawler = crawler is None
+    if owns_crawler:
+        crawler = Crawler(
+            max_depth=1,  # Only crawl the main page and direct links
+            timeout=timeout,
+            max_pages=max_pages,
+            max_workers=10
+        )
+
+    # Start crawling (async fetches when aiohttp is installed)
+    start_time = time.time()
+    try:
+        # The charsets are copied before the crawl lock is released, since a shared crawler
+        # may start another crawl as soon as this one finishes
+        pages, encodings = asyncio.run(crawler.crawl_async(url, with_encodings=True))
+    finally:
+        # Crawlers passed in by the caller stay open for reuse
+        if owns_crawler:
+            crawler.close()
+    crawl_time = time.time() - start_time
+
+    if not pages:
+        raise CrawlError(f"Failed to crawl {domain}")
+
+    # Step 2: Parse the HTML content
+    _report(progress, 40, f"Crawled {len(pages)} pages in {crawl_time:.2f} seconds, parsing content...")
+    parse_start_time = time.time()
+
+    # Initialize parser with aggressive settings for better submodule detection
+    owns_parser = parser is None
+    if owns_parser:
+        parser = Parser(
+            quick_mode=False,
+            aggressive_submodule_detection=aggressive
+        )
+
+    # Parse the content
+    try:
+        all_modules = parser.parse_html_batch(pages, encodings)
+    finally:
+        # Parsers passed in by the caller keep their worker processes for reuse
+        if owns_parser:
+            parser.close()
+    parse_time = time.time() - parse_start_time
+
+    _report(progress, 70, f"Parsed {len(pages)} pages in {parse_time:.2f} seconds")
+
+    return len(pages), all_modules
+
+
+def run_pipeline(url, max_pages=20, timeout=3, aggressive=True, progress=None, crawler=None, parser=None):
+    """
+    Crawl a documentation website, extract its modules and format them as JSON.
+
+    Args:
+        url (str): Normalized URL of the documentation website
+        max_pages (int): Maximum number of pages to crawl
+        timeout (int): Timeout for HTTP requests in seconds
+        aggressive (bool): Whether to use aggressive submodule detection
+        progress (callable): Optional callback taking (percent, message)
+        crawler (Crawler): Optional crawler to reuse, built from the options otherwise
+        parser (Parser): Optional parser to reuse, built from the options otherwise
+
+    Returns:
+        dict: Pipeline result with pages_count, modules (as parsed), formatted_modules,
+            total_submodules and json_bytes (UTF-8 encoded JSON)
+
+    Raises:
+        CrawlError: If no pages could be crawled
+    """
+    pages_count, all_modules = crawl_and_parse(url, max_pages, timeout, aggressive, progress, crawler, parser)
+
+    # Step 3: Format the results
+    _report(progress, 90, "Formatting results...")
+    formatted_modules, total_submodules = format_modules(all_modules)
+
+    return {
+        "pages_count": pages_count,
+        "modules": all_modules,
+        "formatted_modules": formatted_modules,
+        "total_submodules": total_submodules,
+        "json_bytes": dumps_json_bytes(formatted_modules, indent=2)
+    }
@@ -2,7 +2,10 @@
 Utility functions for the documentation structure extractor.
 """
 import re
+import hashlib
 import logging
+import math
+from functools import lru_cache
 from urllib.parse import urlparse, urljoin
 
 # Configure logging
@@ -12,9 +15,31 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Absolute URLs with a printable ASCII host and no IPv6 brackets, which urlparse always splits
+# into a non-empty scheme and the netloc captured here
+_ABSOLUTE_URL_RE = re.compile(r'[A-Za-z][A-Za-z0-9+.\-]*://([!"$-.0->@-Z\\^-~]+)(?:[/?#]|\Z)')
+
+# Fragment-free absolute URLs that urlparse and geturl reproduce unchanged: a lowercase scheme,
+# a printable ASCII host and no whitespace, parameters or empty trailing query
+_CANONICAL_URL_RE = re.compile(r'[a-z][a-z0-9+.\-]*://[!"$-.0->@-Z\\^-~]+(?:[/?][^\s;#]*)?(?<!\?)')
+
+@lru_cache(maxsize=4096)
+def cached_urlparse(url):
+    """
+    Parse a URL, caching the result since the crawler parses the same URLs many times.
+
+    Args:
+        url (str): URL to parse
+
+    Returns:
+        ParseResult: Parsed URL (an immutable named tuple, safe to share)
+    """
+    return urlparse(url)
+
 def is_valid_url(url):
     """
     Check if the provided URL is valid.
+    Results for up to 8192 URLs are memoized, as the same links are checked from many pages.
     
     Args:
         url (str): URL to validate
@@ -22,16 +47,38 @@ def is_valid_url(url):
     Returns:
         bool: True if URL is valid, False otherwise
     """
+    # Only strings are cached (and valid); anything else may not even be hashable
+    if not isinstance(url, str):
+        return False
+    return _is_valid_url_cached(url)
+
+@lru_cache(maxsize=8192)
+def _is_valid_url_cached(url):
+    """
+    Check if a URL string is valid, memoizing the result.
+
+    Args:
+        url (str): URL to validate
+
+    Returns:
+        bool: True if URL is valid, False otherwise
+    """
+    # The common case takes one regex match; anything else gets the full parse
+    if _ABSOLUTE_URL_RE.match(url):
+        return True
+
     try:
-        result = urlparse(url)
+        result = cached_urlparse(url)
         return all([result.scheme, result.netloc])
     except Exception as e:
-        logger.error(f"Error validating URL: {e}")
+        logger.error("Error validating URL: %s", e)
         return False
 
+@lru_cache(maxsize=50_000)
 def normalize_url(url):
     """
     Normalize a URL by removing fragments and ensuring proper format.
+    Results are memoized, as the crawler sees the same links on many pages.
     
     Args:
         url (str): URL to normalize
@@ -39,13 +86,19 @@ def normalize_url(url):
     Returns:
         str: Normalized URL
     """
+    # Most URLs only need their fragment cut off, without a parse and rebuild
+    if isinstance(url, str):
+        head = url.partition('#')[0]
+        if _CANONICAL_URL_RE.fullmatch(head):
+            return head
+
     try:
-        parsed = urlparse(url)
+        parsed = cached_urlparse(url)
         # Remove fragments
         normalized = parsed._replace(fragment='').geturl()
         return normalized
     except Exception as e:
-        logger.error(f"Error normalizing URL: {e}")
+        logger.error("Error normalizing URL: %s", e)
         return url
 
 def is_same_domain(url1, url2):
@@ -59,14 +112,45 @@ def is_same_domain(url1, url2):
     Returns:
         bool: True if URLs belong to the same domain, False otherwise
     """
+    # Common absolute URLs compare their netlocs straight from one regex match each
+    if isinstance(url1, str) and isinstance(url2, str):
+        match1 = _ABSOLUTE_URL_RE.match(url1)
+        match2 = match1 and _ABSOLUTE_URL_RE.match(url2)
+        if match2:
+            return match1.group(1) == match2.group(1)
+
     try:
-        domain1 = urlparse(url1).netloc
-        domain2 = urlparse(url2).netloc
+        domain1 = cached_urlparse(url1).netloc
+        domain2 = cached_urlparse(url2).netloc
         return domain1 == domain2
     except Exception as e:
-        logger.error(f"Error comparing domains: {e}")
+        logger.error("Error comparing domains: %s", e)
         return False
 
+def make_same_domain_checker(base_url):
+    """
+    Build a check for whether URLs are http(s) links to the same host as a base URL, ignoring case.
+    The check compares prefixes instead of parsing each URL, so it expects normalized URLs.
+
+    Args:
+        base_url (str): URL whose host links must match
+
+    Returns:
+        callable: Function taking a URL and returning True if it is on the same host
+    """
+    host = cached_urlparse(base_url).netloc.lower()
+    prefixes = (f"http://{host}", f"https://{host}")
+
+    def is_same_host(url):
+        for prefix in prefixes:
+            end = len(prefix)
+            # The host must end there, so "example.com" does not match "example.com.evil.net"
+            if url[:end].lower() == prefix and (len(url) == end or url[end] in '/?#'):
+                return True
+        return False
+
+    return is_same_host
+
 def clean_text(text):
     """
     Clean text by removing extra whitespace and normalizing.
@@ -80,8 +164,64 @@ def clean_text(text):
     if not text:
         return ""
     
-    # Replace multiple whitespace with a single space
-    text = re.sub(r'\s+', ' ', text)
-    # Remove leading/trailing whitespace
-    text = text.strip()
-    return text
+    # str.split() splits on runs of exactly the characters \s matches and drops leading/trailing
+    # whitespace, so joining the words with single spaces needs no regex
+    return ' '.join(text.split())
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter for strings. Membership tests may return false positives
+    at about the configured error rate once `capacity` items are added, never false negatives.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        """
+        Initialize the filter.
+
+        Args:
+            capacity (int): Expected number of items
+            error_rate (float): Target false positive rate at capacity
+        """
+        capacity = max(capacity, 1)
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item):
+        """
+        Compute the bit positions of an item by double hashing one blake2b digest.
+
+        Args:
+            item (str): Item to hash
+
+        Returns:
+            list: Bit positions
+        """
+        digest = hashlib.blake2b(item.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        num_bits = self.num_bits
+        return [(h1 + i * h2) % num_bits for i in range(self.num_hashes)]
+
+    def add(self, item):
+        """
+        Add an item.
+
+        Args:
+            item (str): Item to add
+
+        Returns:
+            bool: True if the item was not (probably) present before
+        """
+        added = False
+        bits = self.bits
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                added = True
+        return added
+
+    def __contains__(self, item):
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))